@@ -1,656 +1,1843 @@
-"""
-Kickstarter Campaign Feature Processor
-
-This module provides functionality to transform raw Kickstarter campaign data into 
-machine learning features suitable for prediction models. It handles textual data
-using state-of-the-art embedding techniques and processes numeric data with 
-appropriate transformations.
-
-The main class, CampaignProcessor, orchestrates the feature generation pipeline,
-converting unstructured campaign data into a structured numerical representation
-that captures semantic meaning and relevant campaign attributes.
-
-Usage:
-    processor = CampaignProcessor(data=campaigns)
-    processed_data = []
-    for idx, campaign in enumerate(campaigns):
-        processed_campaign = processor.process_campaign(campaign, idx)
-        processed_data.append(processed_campaign)
-
-Features generated include:
-- Text embeddings (description, blurb, risks) using transformer models
-- Category and subcategory encodings
-- Country information embeddings
-- Funding goal transformations
-- Campaign metadata features
-
-Copyright (c) 2025 Qian Yongkun Jonathan
-"""
-
-import json
-import numpy as np
-from typing import Dict, List, Tuple, Any, Optional
-from datetime import datetime
-import torch
-from transformers import AutoTokenizer, AutoModel
-from tqdm import tqdm
-import gc
-import gensim.downloader
-from gensim.models import KeyedVectors
-from gensim.parsing.preprocessing import preprocess_string
-#import time
-
-
-class CampaignProcessor:
-    """
-    A class for processing Kickstarter campaign data into machine learning features.
-
-    This class handles the transformation of raw campaign data into numerical features
-    suitable for machine learning models. It uses various embedding techniques for text
-    data and appropriate transformations for numerical data.
-
-    Attributes:
-        data (list): List of raw campaign data
-        categories (list): Sorted list of unique campaign categories
-        tokenizer (AutoTokenizer): Tokenizer for the Longformer model
-        model (AutoModel): Longformer model for description processing
-        RiskandBlurb_tokenizer (AutoTokenizer): Tokenizer for the MiniLM model
-        RiskandBlurb_model (AutoModel): MiniLM model for shorter text processing
-        glove (KeyedVectors): Pre-trained GloVe word embeddings
-        device (torch.device): Device (CPU/GPU) for model computations
-
-    Methods:
-        process_description_embedding: Generates embeddings for campaign descriptions
-        process_riskandchallenges_embedding: Generates embeddings for risk statements
-        process_blurb: Generates embeddings for campaign blurbs
-        process_category: One-hot encodes campaign categories
-        process_subcategory_embedding: Generates embeddings for subcategories
-        process_country_embedding: Generates embeddings for countries
-        process_funding_goal: Transforms funding goals using log transformation
-        process_previous_funding_goal: Transforms previous funding goals
-        process_previous_pledged: Transforms previous pledged amounts
-        calculate_previous_sucess_rate: Calculates success rate of previous campaigns
-        process_campaign: Processes all features for a single campaign
-    """
-
-
-    def __init__(self, data):
-        self.data = data
-        self.categories = sorted(list(set(camp.get('category', '') for camp in self.data)))
-
-         # Initialize Longformer model and tokenizer (for processing description)
-        model_name = "allenai/longformer-base-4096"
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        self.model = AutoModel.from_pretrained(model_name)
-
-        # Initialize minilm model and tokenizer (for processing risk and blurb)
-        RiskandBlurb_model_name = "sentence-transformers/all-minilm-l6-v2"
-        self.RiskandBlurb_tokenizer = AutoTokenizer.from_pretrained(RiskandBlurb_model_name)
-        self.RiskandBlurb_model = AutoModel.from_pretrained(RiskandBlurb_model_name)
-
-        # Load GloVe model for country and subcategory embeddings
-        self.glove = gensim.downloader.load('glove-wiki-gigaword-100')
-
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        self.model = self.model.to(self.device)
-        self.RiskandBlurb_model = self.RiskandBlurb_model.to(self.device)
-
-
-    
-    def process_description_embedding(self, campaign: Dict, idx: int) -> Tuple[np.ndarray, int]:
-        """
-        Process campaign description text into numerical embeddings using Longformer.
-
-        We use the Longformer model (allenai/longformer-base-4096) to process the 
-        description texts, as they are usually very long. This method handles
-        tokenization, embedding generation, memory management, and error cases.
-
-        Args:
-            campaign: Dictionary containing campaign data
-            idx: Index of the campaign in the dataset (for error reporting)
-
-        Returns:
-            Tuple containing:
-                - A 768-dimensional vector embedding of the description
-                - Integer representing the description length (word count)
-
-        Raises:
-            Various exceptions may be caught internally and handled by returning zero vectors
-        """
-        try:
-            # Get description from the campaign
-            text = campaign.get("description", '')
-            
-            description_length = len(text.split())
-
-            # Clear GPU/CPU memory
-            if self.device.type == 'cuda':
-                torch.cuda.empty_cache()
-            gc.collect()
-
-            # Tokenize
-            inputs = self.tokenizer(text, 
-                                padding=True, 
-                                truncation=True, 
-                                max_length=4096, 
-                                return_tensors="pt")
-            
-            # Move inputs to device
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
-            # Generate embeddings
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-            
-            # Get sentence embeddings through mean pooling
-            attention_mask = inputs['attention_mask']
-            token_embeddings = outputs.last_hidden_state
-            input_mask_expanded = attention_mask.unsqueeze(-1).expand(token_embeddings.size()).float()
-            sentence_embeddings = torch.sum(token_embeddings * input_mask_expanded, 1) / torch.clamp(input_mask_expanded.sum(1), min=1e-9)
-            
-            # Move to CPU and convert to numpy
-            embedding = sentence_embeddings.cpu().numpy()
-            
-            # Clear some memory
-            del inputs, outputs, token_embeddings, sentence_embeddings
-            if self.device.type == 'cuda':
-                torch.cuda.empty_cache()
-            gc.collect()
-
-            return embedding[0], description_length # Return the single embedding array and length of description
-        
-        except Exception as e:
-            print(f"Error processing description for campaign {idx}: {str(e)}")
-            return np.zeros(768), 0 # Return zero vector of appropriate size (768 for base Longformer)
-    
-
-    def process_riskandchallenges_embedding(self, campaign: Dict, idx: int) -> np.ndarray:
-        """
-        Process campaign risk and challenges text into numerical embeddings using MiniLM.
-
-        We use the MiniLM model (sentence-transformers/all-minilm-l6-v2) to process the
-        risk and challenges texts, as it is efficient for shorter text sequences and
-        good for semantic similarity tasks.
-
-        Args:
-            campaign: Dictionary containing campaign data
-            idx: Index of the campaign in the dataset (for error reporting)
-
-        Returns:
-            A 384-dimensional vector embedding of the risk and challenges text
-
-        Raises:
-            Various exceptions may be caught internally and handled by returning zero vectors
-        """
-        try:
-            text = campaign.get("risk", '')
-            
-            # Clear GPU/CPU memory
-            if self.device.type == 'cuda':
-                torch.cuda.empty_cache()
-            gc.collect()
-
-            # Tokenize
-            inputs = self.RiskandBlurb_tokenizer(text, 
-                            padding=True, 
-                            truncation=True, 
-                            max_length=512,  # minilm uses smaller max length
-                            return_tensors="pt")
-            
-            # Move inputs to device
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-
-            with torch.no_grad():
-                outputs = self.RiskandBlurb_model(**inputs)
-            
-            # Get sentence embeddings through mean pooling
-            attention_mask = inputs['attention_mask']
-            token_embeddings = outputs.last_hidden_state
-            input_mask_expanded = attention_mask.unsqueeze(-1).expand(token_embeddings.size()).float()
-            sentence_embeddings = torch.sum(token_embeddings * input_mask_expanded, 1) / torch.clamp(input_mask_expanded.sum(1), min=1e-9)
-        
-            # Move to CPU and convert to numpy
-            embedding = sentence_embeddings.cpu().numpy()
-        
-            # Clear some memory
-            del inputs, outputs, token_embeddings, sentence_embeddings
-            if self.device.type == 'cuda':
-                torch.cuda.empty_cache()
-            gc.collect()
-            
-            return embedding[0]
-
-        except Exception as e:
-            print(f"Error processing risk statement for campaign {idx}: {str(e)}")
-            return np.zeros(384) # Return zero vector of appropriate size for minilm
-
-    def process_blurb(self, campaign: Dict, idx: int) -> np.ndarray:
-        """
-        Process campaign blurb text into numerical embeddings using MiniLM.
-
-        We use the MiniLM model (sentence-transformers/all-minilm-l6-v2) to process
-        the blurb texts, as it is efficient for shorter text sequences and good for
-        semantic similarity tasks.
-
-        Args:
-            campaign: Dictionary containing campaign data
-            idx: Index of the campaign in the dataset (for error reporting)
-
-        Returns:
-            A 384-dimensional vector embedding of the blurb text
-
-        Raises:
-            Various exceptions may be caught internally and handled by returning zero vectors
-        """
-        try:
-            text = campaign.get("blurb", '')
-            
-            # Clear GPU/CPU memory
-            if self.device.type == 'cuda':
-                torch.cuda.empty_cache()
-            gc.collect()
-
-            # Tokenize
-            inputs = self.RiskandBlurb_tokenizer(text, 
-                            padding=True, 
-                            truncation=True, 
-                            max_length=512,
-                            return_tensors="pt")
-            
-            # Move inputs to device
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-
-            with torch.no_grad():
-                outputs = self.RiskandBlurb_model(**inputs)
-            
-            # Get sentence embeddings through mean pooling
-            attention_mask = inputs['attention_mask']
-            token_embeddings = outputs.last_hidden_state
-            input_mask_expanded = attention_mask.unsqueeze(-1).expand(token_embeddings.size()).float()
-            sentence_embeddings = torch.sum(token_embeddings * input_mask_expanded, 1) / torch.clamp(input_mask_expanded.sum(1), min=1e-9)
-        
-            # Move to CPU and convert to numpy
-            embedding = sentence_embeddings.cpu().numpy()
-        
-            # Clear some memory
-            del inputs, outputs, token_embeddings, sentence_embeddings
-            if self.device.type == 'cuda':
-                torch.cuda.empty_cache()
-            gc.collect()
-            
-            return embedding[0]
-
-        except Exception as e:
-            print(f"Error processing blurb for campaign {idx}: {str(e)}")
-            return np.zeros(384) # Return zero vector of appropriate size for minilm
-
-
-
-
-
-    def process_category(self, campaign: Dict) -> List[int]:
-        """
-        Process campaign category using one-hot encoding.
-
-        This method converts categorical data into binary vectors where each position
-        corresponds to a unique category, with 1 indicating the category of the campaign
-        and 0 elsewhere.
-
-        Args:
-            campaign: Dictionary containing campaign data
-
-        Returns:
-            List of integers (0s and 1s) representing the one-hot encoded category
-
-        Raises:
-            Various exceptions may be caught internally and handled by returning zero vectors
-        """
-        try:
-            category = campaign.get('category', '')
-            # Create one-hot encoded list
-            encoding = [1 if cat == category else 0 for cat in self.categories]
-            return encoding
-            
-        except Exception as e:
-            print(f"Error processing category: {str(e)}")
-            return [0] * len(self.categories)  # Return all zeros if error
-
-
-
-
-    def process_subcategory_embedding(self, campaign: Dict, idx: int) -> np.ndarray:
-        """
-        Process campaign subcategory text into numerical embeddings using GloVe.
-
-        We use the GloVe embeddings (glove-wiki-gigaword-100), which captures 
-        semantic relationships between words, to process subcategory text.
-
-        Args:
-            campaign: Dictionary containing campaign data
-            idx: Index of the campaign in the dataset (for error reporting)
-
-        Returns:
-            A 100-dimensional vector embedding of the subcategory
-
-        Raises:
-            Various exceptions may be caught internally and handled by returning zero vectors
-        """
-        try:
-            text = campaign.get('subcategory', '').lower().strip()
-            
-            if not text:
-                return np.zeros(100)
-            
-            # Tokenize the text by simple whitespace split
-            tokens = text.split()
-
-            # Get embeddings for all available words
-            word_vectors = []
-            for word in tokens:
-                try:
-                    word_vectors.append(self.glove[word])
-                except KeyError:
-                    continue
-            
-            if not word_vectors:
-                return np.zeros(100)
-                
-            # Average the word vectors
-            return np.mean(word_vectors, axis=0)
-
-        except Exception as e:
-            print(f"Error processing subcategory for campaign {idx}: {str(e)}")
-            return np.zeros(100)
-
-
-
-    def process_country_embedding(self, campaign: Dict, idx: int) -> np.ndarray:
-        """
-        Process campaign country information into numerical embeddings using GloVe.
-
-        We use the GloVe embeddings (glove-wiki-gigaword-100), which captures 
-        semantic relationships between words, to process country names.
-
-        Args:
-            campaign: Dictionary containing campaign data
-            idx: Index of the campaign in the dataset (for error reporting)
-
-        Returns:
-            A 100-dimensional vector embedding of the country
-
-        Raises:
-            Various exceptions may be caught internally and handled by returning zero vectors
-        """
-        try:
-            text = campaign.get('country', '').lower().strip()
-            
-            
-            if not text:
-                return np.zeros(100)
-            
-            # Tokenize the text by simple whitespace split
-            tokens = text.split()
-            
-            # Get embeddings for all available words
-            word_vectors = []
-            for word in tokens:
-                try:
-                    word_vectors.append(self.glove[word])
-                except KeyError:
-                    continue
-            
-            if not word_vectors:
-                return np.zeros(100)
-                
-            # Average the word vectors
-            return np.mean(word_vectors, axis=0)
-
-        except Exception as e:
-            print(f"Error processing country for campaign {idx}: {str(e)}")
-            return np.zeros(100)
-
-        
-    def process_funding_goal(self, campaign: Dict, idx: int) -> float:
-        """
-        Process campaign funding goal with logarithmic compression.
-
-        Applies Log1p transformation with base 10 to compress extreme values while
-        preserving relative differences between funding goals.
-
-        Args:
-            campaign: Dictionary containing campaign data
-            idx: Index of the campaign in the dataset (for error reporting)
-
-        Returns:
-            Float representing the transformed funding goal
-
-        Raises:
-            Various exceptions may be caught internally and handled by returning zero
-        """
-        try:
-            goal = float(campaign.get('funding_goal', 0))
-
-            #Log1p transformation, it is good for general compression while preserving relative differences
-            transformed_goal = np.log1p(goal)/np.log(10)
-            
-            return transformed_goal
-            
-        except Exception as e:
-            print(f"Error processing funding goal for campaign {idx}: {str(e)}")
-            return 0.0
-        
-    
-    def process_previous_funding_goal(self, campaign: Dict, idx: int) -> float:
-        """
-        Process previous campaign funding goal with logarithmic compression.
-
-        Applies Log1p transformation with base 10 to compress extreme values while
-        preserving relative differences between previous funding goals.
-
-        Args:
-            campaign: Dictionary containing campaign data
-            idx: Index of the campaign in the dataset (for error reporting)
-
-        Returns:
-            Float representing the transformed previous funding goal
-
-        Raises:
-            Various exceptions may be caught internally and handled by returning zero
-        """
-        try:
-            previous_goal = float(campaign.get('average_funding_goal', 0))
-
-            #Log1p transformation, it is good for general compression while preserving relative differences
-            transformed_goal = np.log1p(previous_goal)/np.log(10)
-            
-            return transformed_goal
-            
-        except Exception as e:
-            print(f"Error processing previous funding goal for campaign {idx}: {str(e)}")
-            return 0.0
-        
-
-    def process_previous_pledged(self, campaign: Dict, idx: int) -> float:
-        """
-        Process previous campaign pledged amount with logarithmic compression.
-
-        Applies Log1p transformation with base 10 to compress extreme values while
-        preserving relative differences between previous pledged amounts.
-
-        Args:
-            campaign: Dictionary containing campaign data
-            idx: Index of the campaign in the dataset (for error reporting)
-
-        Returns:
-            Float representing the transformed previous pledged amount
-
-        Raises:
-            Various exceptions may be caught internally and handled by returning zero
-        """
-        try:
-            pledged = float(campaign.get('average_pledged', 0))
-
-            #Log1p transformation, it is good for general compression while preserving relative differences
-            transformed_pledge = np.log1p(pledged)/np.log(10)
-            
-            return transformed_pledge
-            
-        except Exception as e:
-            print(f"Error processing pledge amount for campaign {idx}: {str(e)}")
-            return 0.0
-    
-
-    def calculate_previous_sucess_rate(self, campaign: Dict, idx: int) -> float:
-        """
-        Calculate success rate of creator's previous campaigns.
-
-        Computes the ratio of successful previous projects to total previous projects.
-
-        Args:
-            campaign: Dictionary containing campaign data
-            idx: Index of the campaign in the dataset (for error reporting)
-
-        Returns:
-            Float between 0.0 and 1.0 representing the previous success rate
-
-        Raises:
-            Various exceptions may be caught internally and handled by returning zero
-        """
-        try:
-            previousProjects= float(campaign.get('previous_projects', 0))
-            previousSuccessfulProjects = float(campaign.get('previous_successful_projects', 0))
-            if previousSuccessfulProjects == 0.0:
-                return 0.0
-            else:
-                previous_success_rate =  previousSuccessfulProjects/ previousProjects
-                return  previous_success_rate 
-            
-        except Exception as e:
-            print(f"Error calculating previous success rate")
-            return 0.0
-    
-
-    def process_campaign(self, campaign: Dict, idx: int) -> Dict[str, Any]:
-        """
-        Process all features for a single campaign.
-
-        This is the main method that orchestrates the extraction and transformation of
-        all features for a campaign, combining text embeddings and numerical features
-        into a single dictionary ready for machine learning models.
-
-        Args:
-            campaign: Dictionary containing raw campaign data
-            idx: Index of the campaign in the dataset (for error reporting)
-
-        Returns:
-            Dictionary containing the campaign ID and all processed features
-
-        Raises:
-            Various exceptions are handled in the individual processing methods
-        """
-
-        description_embedding, description_length = self.process_description_embedding(campaign, idx)
-
-        return {
-            'id': campaign.get('id', str(idx)),
-            'description_embedding': description_embedding.tolist(),
-            'description_length': description_length,
-            'blurb_embedding': self.process_blurb(campaign, idx).tolist(),
-            'risk_embedding': self.process_riskandchallenges_embedding(campaign, idx).tolist(),
-            'category_embedding': self.process_category(campaign),
-            'subcategory_embedding': self.process_subcategory_embedding(campaign, idx).tolist(),
-            'country_embedding': self.process_country_embedding(campaign, idx).tolist(),
-            'funding_goal': self.process_funding_goal(campaign, idx),
-            'image_count': int(campaign['image_count']) if 'image_count' in campaign else 0,  # Access from campaign
-            'video_count': int(campaign['video_count']) if 'video_count' in campaign else 0,
-            'campaign_duration': int(campaign['campaign_duration']) if 'campaign_duration' in campaign else 0,  # Access from campaign
-            'previous_projects_count': int(campaign['previous_projects']) if 'previous_projects' in campaign else 0,
-            'previous_success_rate': self.calculate_previous_sucess_rate(campaign, idx),
-            'previous_pledged': self.process_previous_pledged(campaign, idx),
-            'previous_funding_goal': self.process_previous_funding_goal(campaign, idx),
-            'state': campaign['state'] if 'state' in campaign else 0
-        }
-
-def main():
-    """
-    Main function to process campaign data and save the results.
-
-    This function:
-    1. Loads campaign data from a JSON file
-    2. Initializes the CampaignProcessor
-    3. Processes all campaigns
-    4. Saves the processed data to a new JSON file
-    5. Reports processing statistics
-
-    The function includes progress tracking and error handling for the processing pipeline.
-    """
-
-    #start_time = time.time()
-    
-    # Load campaign data
-    file_path = "Data/pre_inputdata.json"
-    with open(file_path, 'r', encoding='utf-8') as file:
-        campaigns_dict = json.load(file)
-
-    # Convert dictionary to list of campaigns, adding ID as a field
-    campaigns = []
-    for campaign_id, campaign_data in campaigns_dict.items():
-        campaign_data["id"] = campaign_id
-        campaigns.append(campaign_data)
-
-    # Initialize processor with embeddings
-    processor = CampaignProcessor(data=campaigns)  # final_embeddings from your previous code
-
-
-    # Process all campaigns with progress tracking
-    processed_campaigns = []
-    total_campaigns = len(campaigns)
-    print(f"\nStarting to process {total_campaigns} campaigns...")
-
-    for idx, campaign in enumerate(campaigns):
-        print(f"Processing campaign {idx + 1}/{total_campaigns} (ID: {campaign['id']})", end='\r')
-        processed_campaign = processor.process_campaign(campaign, idx)
-
-        # Add the processed campaign to our list
-        processed_campaigns.append(processed_campaign)
-
-
-    #-------------------------------------------------------------------------------------------------
-    #print(processed_campaigns[0].keys())
-    #print(len(processed_campaigns))
-    #print(f"description_embedding: {processed_campaigns[0]['description_embedding']}")
-    #print(f"description length: {processed_campaigns[0]['description_length']}")
-    #print(f"blurb_embedding: {processed_campaigns[0]['blurb_embedding']}")
-    #print(f"risk_embedding: {processed_campaigns[0]['risk_embedding']}")
-    #print(f"Subcategory_embedding: {processed_campaigns[0]['subcategory_embedding']}")
-    #print(f"Country_embedding: {processed_campaigns[0]['country_embedding']}")
-    #print(f"Funding_goal: {processed_campaigns[0]['funding_goal']}")
-    #print(f"campaign_duration: {processed_campaigns[0]['campaign_duration']}")
-    #print(f"category_embedding: {processed_campaigns[0]['category_embedding']}")
-    #print(f"image_count: {processed_campaigns[0]['image_count']}")
-    #print(f"video_count: {processed_campaigns[0]['video_count']}")
-    #print(f"previous_projects_count: {processed_campaigns[0]['previous_projects_count']}")
-    #print(f"previous_success_rate: {processed_campaigns[0]['previous_success_rate']}")
-    #print(f"previous_pledged: {processed_campaigns[0]['previous_pledged']}")
-    #print(f"previous_funding_goal: {processed_campaigns[0]['previous_funding_goal']}")
-    #print(f"state: {processed_campaigns[0]['state']}")
-    #-------------------------------------------------------------------------------------------------
-
-    output_file_path = "allProcessed.json"
-    try:
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            json.dump(processed_campaigns, f, indent=2)
-        print(f"Successfully saved processed campaigns to {output_file_path}")
-    except Exception as e:
-        print(f"Error saving to file: {str(e)}")
-
-
-    #end_time = time.time()
-    #execution_time = end_time - start_time
-    #print(f"Total execution time: {execution_time:.2f} seconds")
-    #print(f"Average time per campaign: {execution_time/len(processed_campaigns):.2f} seconds")
-
-if __name__ == "__main__":
-    main()
-
+"""
+Kickstarter Campaign Feature Processor
+
+This module provides functionality to transform raw Kickstarter campaign data into 
+machine learning features suitable for prediction models. It handles textual data
+using state-of-the-art embedding techniques and processes numeric data with 
+appropriate transformations.
+
+The main class, CampaignProcessor, orchestrates the feature generation pipeline,
+converting unstructured campaign data into a structured numerical representation
+that captures semantic meaning and relevant campaign attributes.
+
+Usage:
+    processor = CampaignProcessor(data=campaigns)
+    processor.precompute_text_embeddings(batch_size=16)
+    processor.precompute_numeric_features()
+    processor.precompute_glove_embeddings()
+    processed_data = []
+    for idx, campaign in enumerate(campaigns):
+        processed_campaign = processor.process_campaign(campaign, idx)
+        processed_data.append(processed_campaign)
+
+    For large datasets, iter_processed_campaigns(processor) yields the processed
+    campaigns chunk by chunk, encoding one chunk of texts at a time.
+
+Features generated include:
+- Text embeddings (description, blurb, risks) using transformer models
+- Category and subcategory encodings
+- Country information embeddings
+- Funding goal transformations
+- Campaign metadata features
+
+Copyright (c) 2025 Qian Yongkun Jonathan
+"""
+
+import os
+import math
+import logging
+import base64
+import hashlib
+import queue
+import threading
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import lru_cache
+import numpy as np
+import orjson
+from scipy import sparse
+from typing import Dict, List, Tuple, Any, Optional, Iterator
+from datetime import datetime
+
+# Let the Rust tokenizers parallelize batch encoding across CPU cores
+os.environ.setdefault('TOKENIZERS_PARALLELISM', 'true')
+# Let the CUDA caching allocator grow segments instead of fragmenting on
+# Longformer's variable-size activations; must be set before torch is imported
+os.environ.setdefault('PYTORCH_CUDA_ALLOC_CONF', 'expandable_segments:True,max_split_size_mb:128')
+
+import torch
+from transformers import AutoTokenizer, AutoModel
+from tqdm import tqdm
+import gensim.downloader
+from gensim.models import KeyedVectors
+from gensim.parsing.preprocessing import preprocess_string
+#import time
+
+logger = logging.getLogger(__name__)
+
+# Number of processed campaigns handed to the writer thread at a time
+WRITE_CHUNK_SIZE = 1000
+
+# Chunks submitted per worker process ahead of the one being written
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+# Supported models for description embeddings
+DESCRIPTION_ENCODERS = ('longformer', 'minilm', 'hybrid')
+
+# 768-dimensional encoder for short descriptions with description_encoder='hybrid'
+SHORT_DESCRIPTION_MODEL = "sentence-transformers/all-mpnet-base-v2"
+
+# Descriptions of at most this many Longformer tokens count as short
+SHORT_DESCRIPTION_MAX_TOKENS = 512
+
+# Multiplier turning a natural logarithm into a base-10 one
+_LN10_INV = 1.0 / math.log(10.0)
+
+# Upper bound on padded tokens (batch size x sequence length) per Longformer
+# forward pass, so batches of 4096-token descriptions stay within GPU memory
+DESCRIPTION_BATCH_TOKENS = 16384
+
+# Sequence length multiple that short-text batches are padded up to. Rounding
+# lengths keeps the number of distinct tensor shapes small, so the CUDA caching
+# allocator (and torch.compile) can reuse blocks and kernels across batches.
+SHORT_TEXT_PAD_MULTIPLE = 64
+
+# Number of padded mini-batches prepared ahead of the forward pass
+PREFETCH_BATCHES = 2
+
+# Window overlap (in tokens) when encoding long descriptions with minilm
+DESCRIPTION_WINDOW_STRIDE = 64
+
+# Maximum number of texts kept in the transformer embedding cache (a
+# 768-dimensional entry takes about 3 KB); least recently used texts are evicted
+EMBEDDING_CACHE_SIZE = 20000
+
+# Worker processes used by main(); None uses one per GPU, or a single process without GPUs
+NUM_WORKERS = None
+
+
+@lru_cache(maxsize=None)
+def _load_pretrained(model_name: str) -> Tuple[Any, Any]:
+    """
+    Load a Hugging Face tokenizer and model, at most once per process.
+
+    Creating several CampaignProcessor instances (or importing this module from
+    worker code) reuses the already loaded weights instead of reading them from
+    disk again. Models are loaded with PyTorch's fused attention kernels (SDPA)
+    when their architecture supports it, and with the default attention otherwise.
+
+    Args:
+        model_name: Name of the pretrained model on the Hugging Face hub
+
+    Returns:
+        Tuple of (tokenizer, model)
+
+    Raises:
+        RuntimeError: If the model has no fast (Rust) tokenizer
+    """
+    tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+    if not tokenizer.is_fast:
+        # The batched encoders rely on the Rust tokenizer for speed and for
+        # overflow_to_sample_mapping
+        raise RuntimeError(f"No fast tokenizer available for {model_name}")
+    try:
+        # Fused scaled_dot_product_attention kernels (FlashAttention / memory
+        # efficient attention) where the architecture supports them
+        model = AutoModel.from_pretrained(model_name, attn_implementation="sdpa")
+    except (ValueError, TypeError):
+        # e.g. Longformer, whose sliding-window attention has no SDPA version
+        model = AutoModel.from_pretrained(model_name)
+    return tokenizer, model
+
+
+@lru_cache(maxsize=None)
+def _compile_model(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Wrap a model with torch.compile, at most once per model and process.
+
+    Compiled graphs are cached by the returned wrapper, so processors sharing the
+    same loaded model (see _load_pretrained) also share its compiled kernels
+    instead of compiling them again.
+
+    Args:
+        model: Model to compile
+
+    Returns:
+        The compiled model
+    """
+    return torch.compile(model, mode='reduce-overhead', dynamic=True)
+
+
+@lru_cache(maxsize=None)
+def _load_glove(name: str) -> KeyedVectors:
+    """
+    Load pretrained GloVe vectors through gensim, at most once per process.
+
+    Args:
+        name: Name of the gensim-data model (e.g. 'glove-wiki-gigaword-100')
+
+    Returns:
+        The word vectors
+    """
+    return gensim.downloader.load(name)
+
+
+def _mean_pool(last_hidden_state: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+    """
+    Average token embeddings over the non-padding positions of each sequence.
+
+    The mask is turned into per-token weights (1 / number of real tokens) and
+    applied in a single reduction, in the dtype of the hidden states. No expanded
+    [B, T, H] mask or float32 copy of the hidden states is materialized, and since
+    the weights already sum to one, a float16 result cannot overflow.
+
+    Args:
+        last_hidden_state: Token embeddings of shape [B, T, H]
+        attention_mask: Mask of shape [B, T], 1 for real tokens and 0 for padding
+
+    Returns:
+        Float32 tensor of shape [B, H] with one mean embedding per sequence
+    """
+    mask = attention_mask.float()
+    weights = mask / mask.sum(1, keepdim=True).clamp_min(1e-9)
+    pooled = torch.einsum('bth,bt->bh', last_hidden_state, weights.to(last_hidden_state.dtype))
+    return pooled.float()
+
+
+def _split_batches(order: np.ndarray, lengths: np.ndarray, batch_size: int,
+                   max_batch_tokens: Optional[int] = None,
+                   pad_to_multiple_of: Optional[int] = None) -> List[np.ndarray]:
+    """
+    Cut a longest-first ordering of sequences into mini-batches.
+
+    Each batch holds at most batch_size sequences and, if max_batch_tokens is given,
+    at most that many tokens after padding to its first (longest) sequence. Batches
+    of long sequences therefore get fewer members than batches of short ones. A
+    sequence longer than the budget still forms a batch on its own.
+
+    Args:
+        order: Sequence positions sorted by decreasing length
+        lengths: Token count of every sequence
+        batch_size: Maximum number of sequences per batch
+        max_batch_tokens: Maximum number of padded tokens per batch
+        pad_to_multiple_of: Multiple the batches are padded up to, if any
+
+    Returns:
+        List of arrays of sequence positions, one per batch
+    """
+    if max_batch_tokens is None:
+        return [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+
+    multiple = pad_to_multiple_of or 1
+    batches = []
+    start = 0
+    while start < len(order):
+        padded_length = max(-(-int(lengths[order[start]]) // multiple) * multiple, 1)
+        size = min(batch_size, max(max_batch_tokens // padded_length, 1))
+        batches.append(order[start:start + size])
+        start += size
+    return batches
+
+
+def _text_key(field: str, text: str) -> Tuple[str, bytes]:
+    """
+    Build the embedding cache key of a text: its field and a BLAKE2b digest.
+
+    Args:
+        field: Cache namespace of the text (e.g. 'description', or 'minilm' for blurbs and risks)
+        text: The text itself
+
+    Returns:
+        Tuple of (field, 16-byte digest of the UTF-8 encoded text)
+    """
+    return field, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def _word_count(text: str) -> int:
+    """
+    Count the whitespace-separated words of a text, i.e. the description length feature.
+
+    str.split() runs in C and is faster than counting regex matches or characters
+    in Python, even though it builds a temporary list of the words.
+
+    Args:
+        text: Text to count the words of
+
+    Returns:
+        Number of words in text
+    """
+    return len(text.split())
+
+
+def _log10p(x: Any) -> float:
+    """
+    Log1p transformation with base 10, i.e. log10(1 + x), for a single value.
+
+    Args:
+        x: Number (or numeric string) to transform
+
+    Returns:
+        The transformed value
+    """
+    return math.log1p(float(x)) * _LN10_INV
+
+
+def _numeric_column(campaigns: List[Dict], key: str, dtype) -> np.ndarray:
+    """
+    Gather one numeric field of many campaigns into a NumPy array.
+
+    Args:
+        campaigns: List of campaign dictionaries
+        key: Name of the numeric field
+        dtype: NumPy dtype of the resulting array
+
+    Returns:
+        Array with one value per campaign, 0 where the field is missing or invalid
+    """
+    values = np.zeros(len(campaigns), dtype=dtype)
+    for i, campaign in enumerate(campaigns):
+        try:
+            values[i] = campaign.get(key, 0)
+        except (TypeError, ValueError):
+            pass
+    return values
+
+
+class CampaignProcessor:
+    """
+    A class for processing Kickstarter campaign data into machine learning features.
+
+    This class handles the transformation of raw campaign data into numerical features
+    suitable for machine learning models. It uses various embedding techniques for text
+    data and appropriate transformations for numerical data.
+
+    Attributes:
+        data (list): List of raw campaign data
+        categories (list): Sorted list of unique campaign categories
+        cat_to_idx (dict): Mapping from category to its one-hot position
+        num_categories (int): Number of unique campaign categories
+        category_eye (np.ndarray): One-hot rows indexed by cat_to_idx, with a final
+            all-zero row for unknown categories
+        description_encoder (str): Model used for descriptions ('longformer', 'minilm' or 'hybrid')
+        description_dim (int): Dimension of the description embeddings (768 or 384)
+        tokenizer (AutoTokenizer): Tokenizer for the description model
+        model (AutoModel): Model for description processing
+        RiskandBlurb_tokenizer (AutoTokenizer): Tokenizer for the MiniLM model
+        RiskandBlurb_model (AutoModel): MiniLM model for shorter text processing
+        short_tokenizer (AutoTokenizer): Tokenizer for short descriptions (hybrid only)
+        short_model (AutoModel): Model for short descriptions (hybrid only)
+        glove (KeyedVectors): Pre-trained GloVe word embeddings
+        glove_k2i (dict): Mapping from GloVe word to its row in glove_vecs
+        glove_vecs (np.ndarray): GloVe vectors as a contiguous (V, 100) float32 matrix
+        device (torch.device): Device (CPU/GPU) for model computations
+        inference_dtype (torch.dtype): Half-precision dtype used for GPU forward passes
+        binary_embeddings (bool): Whether process_campaign emits embeddings as base64
+            float16 strings instead of lists of floats (see decode_embedding)
+        description_embeddings (np.ndarray): Precomputed description embeddings, or None
+        description_lengths (np.ndarray): Precomputed description word counts, or None
+        blurb_embeddings (np.ndarray): Precomputed blurb embeddings, or None
+        risk_embeddings (np.ndarray): Precomputed risk embeddings, or None
+        embedding_offset (int): Index in data of the first precomputed campaign
+        numeric_features (dict): Precomputed numeric feature columns, or None
+        category_onehots (np.ndarray): Precomputed one-hot categories, or None
+        numeric_offset (int): Index in data of the first campaign in numeric_features
+
+    The one-hot category layout is derived from data, or taken from the categories
+    argument when given, which keeps the layout fixed across runs on different data.
+
+    The transformer models can be wrapped with torch.compile (PyTorch 2.0+) by passing
+    compile_models=True. Compilation takes a while up front and pays off on long runs.
+
+    Descriptions are embedded with Longformer by default. Passing
+    description_encoder='minilm' instead encodes them with the much smaller MiniLM model
+    over 512-token windows (64-token overlap) averaged into one 384-dimensional vector.
+    This is many times cheaper, but changes the description feature dimension.
+    With description_encoder='hybrid', descriptions of up to 512 tokens are encoded
+    with the 768-dimensional all-mpnet-base-v2 model and only longer ones with
+    Longformer. The dimension stays 768, but short and long descriptions then come
+    from different embedding spaces.
+
+    Methods:
+        process_description_embedding: Generates embeddings for campaign descriptions
+        process_riskandchallenges_embedding: Generates embeddings for risk statements
+        process_description_embeddings_batch: Generates description embeddings in mini-batches
+        process_risk_embeddings_batch: Generates risk embeddings in mini-batches
+        process_blurb_embeddings_batch: Generates blurb embeddings in mini-batches
+        precompute_text_embeddings: Batch-encodes descriptions, blurbs and risks for all campaigns
+        precompute_numeric_features: Computes numeric features for all campaigns at once
+        precompute_glove_embeddings: Embeds all subcategories and countries at once
+        process_blurb: Generates embeddings for campaign blurbs
+        process_category: One-hot encodes campaign categories
+        process_categories_batch: One-hot encodes the categories of many campaigns
+        process_subcategory_embedding: Generates embeddings for subcategories
+        process_country_embedding: Generates embeddings for countries
+        process_funding_goal: Transforms funding goals using log transformation
+        process_previous_funding_goal: Transforms previous funding goals
+        process_previous_pledged: Transforms previous pledged amounts
+        calculate_previous_sucess_rate: Calculates success rate of previous campaigns
+        process_campaign: Processes all features for a single campaign
+        encode_embedding: Converts an embedding vector into its serialized form
+    """
+
+
+    def __init__(self, data, binary_embeddings: bool = False, compile_models: bool = False,
+                 description_encoder: str = 'longformer', categories: Optional[List[str]] = None):
+        if description_encoder not in DESCRIPTION_ENCODERS:
+            raise ValueError(f"Unknown description encoder: {description_encoder} "
+                             f"(expected one of {', '.join(DESCRIPTION_ENCODERS)})")
+
+        self.data = data
+        self.binary_embeddings = binary_embeddings
+        # Collect the categories in a single pass over the data, unless the caller
+        # already knows them (e.g. to keep the one-hot layout of an earlier run)
+        if categories is None:
+            categories = {camp.get('category', '') for camp in self.data}
+        self.categories = sorted(set(categories))
+        self.cat_to_idx = {cat: i for i, cat in enumerate(self.categories)}
+        self.num_categories = len(self.categories)
+        # One one-hot row per category, plus an all-zero row for unknown categories
+        self.category_eye = np.eye(self.num_categories + 1, self.num_categories, dtype=np.int8)
+
+        # Initialize minilm model and tokenizer (for processing risk and blurb)
+        RiskandBlurb_model_name = "sentence-transformers/all-minilm-l6-v2"
+        self.RiskandBlurb_tokenizer, self.RiskandBlurb_model = _load_pretrained(RiskandBlurb_model_name)
+        self.RiskandBlurb_tokenizer.model_max_length = 512  # minilm uses smaller max length
+
+        self.description_encoder = description_encoder
+        self.short_tokenizer = None
+        self.short_model = None
+        if description_encoder in ('longformer', 'hybrid'):
+            # Initialize Longformer model and tokenizer (for processing description)
+            model_name = "allenai/longformer-base-4096"
+            self.tokenizer, self.model = _load_pretrained(model_name)
+            self.tokenizer.model_max_length = 4096
+            self.description_dim = 768
+            if description_encoder == 'hybrid':
+                # Smaller 768-dimensional model for descriptions that fit in 512 tokens
+                self.short_tokenizer, self.short_model = _load_pretrained(SHORT_DESCRIPTION_MODEL)
+                self.short_tokenizer.model_max_length = SHORT_DESCRIPTION_MAX_TOKENS
+        else:
+            # Reuse minilm for descriptions, encoding long texts in overlapping windows
+            self.tokenizer = self.RiskandBlurb_tokenizer
+            self.model = self.RiskandBlurb_model
+            self.description_dim = 384
+
+        # Load GloVe model for country and subcategory embeddings
+        self.glove = _load_glove('glove-wiki-gigaword-100')
+        # Plain dict and contiguous matrix views of the vocabulary, for fast lookups
+        self.glove_k2i = self.glove.key_to_index
+        self.glove_vecs = np.ascontiguousarray(self.glove.vectors, dtype=np.float32)
+        self._subcat_cache: Dict[str, np.ndarray] = {}
+        self._country_cache: Dict[str, np.ndarray] = {}
+        # Transformer embeddings by (field, text digest), see _cached_embeddings()
+        self._embedding_cache: OrderedDict[Tuple[str, bytes], np.ndarray] = OrderedDict()
+
+        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        # bfloat16 has the range of float32, so long Longformer sums cannot overflow;
+        # fall back to float16 on GPUs without bfloat16 support (pre-Ampere)
+        if self.device.type == 'cuda' and torch.cuda.is_bf16_supported():
+            self.inference_dtype = torch.bfloat16
+        else:
+            self.inference_dtype = torch.float16
+        self.model = self.model.to(self.device)
+        self.RiskandBlurb_model = self.RiskandBlurb_model.to(self.device)
+        if self.short_model is not None:
+            self.short_model = self.short_model.to(self.device)
+
+        # Inference only: disable dropout and stop tracking gradients for the weights
+        for model in (self.model, self.RiskandBlurb_model, self.short_model):
+            if model is None:
+                continue
+            model.eval()
+            for param in model.parameters():
+                param.requires_grad_(False)
+            # Keep the weights in half precision on GPU too, so autocast does not have
+            # to cast them on every forward pass; CPU stays in float32
+            if self.device.type == 'cuda':
+                model.to(self.inference_dtype)
+
+        # Optionally compile the models so their many small per-layer ops are fused
+        # into fewer kernels. dynamic=True avoids recompiling for every new sequence
+        # length; length-bucketed batching keeps the number of shapes small anyway.
+        if compile_models and hasattr(torch, 'compile'):
+            self.RiskandBlurb_model = _compile_model(self.RiskandBlurb_model)
+            if description_encoder == 'minilm':
+                self.model = self.RiskandBlurb_model
+            else:
+                self.model = _compile_model(self.model)
+            if self.short_model is not None:
+                self.short_model = _compile_model(self.short_model)
+            self._warm_up()
+
+        # Batched embeddings, filled in by precompute_text_embeddings()
+        self.description_embeddings = None
+        self.description_lengths = None
+        self.blurb_embeddings = None
+        self.risk_embeddings = None
+        self.embedding_offset = 0
+
+        # Numeric feature columns, filled in by precompute_numeric_features()
+        self.numeric_features = None
+        self.category_onehots = None
+        self.numeric_offset = 0
+
+
+    def _warm_up(self) -> None:
+        """
+        Run one small batch through every model, so that compilation (and CUDA
+        graph capture) happens at construction time instead of in the first chunk.
+        """
+        pairs = [(self.RiskandBlurb_tokenizer, self.RiskandBlurb_model),
+                 (self.tokenizer, self.model),
+                 (self.short_tokenizer, self.short_model)]
+        seen = set()
+        for tokenizer, model in pairs:
+            if model is None or id(model) in seen:
+                continue
+            seen.add(id(model))
+            inputs = self._to_device(tokenizer(["warm up", "warm up the compiled model"],
+                                               padding='longest', return_tensors="pt"))
+            with torch.inference_mode(), self._autocast():
+                model(**inputs)
+
+
+    def _to_device(self, inputs: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        """
+        Copy tokenized inputs to the model device.
+
+        On GPU the tensors are staged in pinned host memory and copied without
+        blocking, so the transfer is queued behind the forward pass instead of
+        synchronizing the device.
+
+        Args:
+            inputs: Dictionary of CPU tensors returned by a tokenizer
+
+        Returns:
+            Dictionary of tensors on self.device
+        """
+        if self.device.type != 'cuda':
+            return {k: v.to(self.device) for k, v in inputs.items()}
+        return {k: (v if v.is_pinned() else v.pin_memory()).to(self.device, non_blocking=True)
+                for k, v in inputs.items()}
+
+
+    def _to_numpy(self, tensor: torch.Tensor) -> np.ndarray:
+        """
+        Copy a tensor from the model device into a NumPy array.
+
+        On GPU the result is copied into a pinned host buffer without blocking and
+        the stream is synchronized once, when the data is actually needed.
+
+        Args:
+            tensor: Tensor on self.device
+
+        Returns:
+            NumPy array with the tensor contents
+        """
+        if self.device.type != 'cuda':
+            return tensor.numpy()
+        host = torch.empty(tensor.shape, dtype=tensor.dtype, pin_memory=True)
+        host.copy_(tensor, non_blocking=True)
+        torch.cuda.current_stream(self.device).synchronize()
+        return host.numpy()
+
+
+    def _autocast(self):
+        """
+        Return the autocast context used around transformer forward passes.
+
+        Forward passes run in half precision (bfloat16 where supported, float16
+        otherwise) on GPU, which halves activation bandwidth and uses tensor cores;
+        numerically sensitive ops such as layer norm and softmax are still computed in
+        float32. On CPU autocast is disabled and the models stay in float32.
+        """
+        return torch.autocast(device_type=self.device.type, dtype=self.inference_dtype,
+                              enabled=self.device.type == 'cuda')
+
+
+    
+    def process_description_embedding(self, campaign: Dict, idx: int) -> Tuple[np.ndarray, int]:
+        """
+        Process campaign description text into numerical embeddings using Longformer.
+
+        We use the Longformer model (allenai/longformer-base-4096) to process the 
+        description texts, as they are usually very long. This method handles
+        tokenization, embedding generation, memory management, and error cases.
+
+        Args:
+            campaign: Dictionary containing campaign data
+            idx: Index of the campaign in the dataset (for error reporting)
+
+        Returns:
+            Tuple containing:
+                - A 768-dimensional vector embedding of the description (384 with minilm)
+                - Integer representing the description length (word count)
+
+        Raises:
+            Various exceptions may be caught internally and handled by returning zero vectors
+        """
+        try:
+            # Get description from the campaign
+            text = campaign.get("description", '')
+
+            if self.description_encoder != 'longformer':
+                embeddings, lengths = self.process_description_embeddings_batch([text])
+                return embeddings[0], int(lengths[0])
+
+            description_length = _word_count(text)
+            key = _text_key('description', text)
+            cached = self._embedding_cache.get(key)
+            if cached is not None:
+                self._embedding_cache.move_to_end(key)
+                return cached, description_length
+
+            # Tokenize
+            inputs = self.tokenizer(text, 
+                                truncation=True, 
+                                return_tensors="pt")
+            
+            # Move inputs to device
+            inputs = self._to_device(inputs)
+            
+            # Generate embeddings
+            with torch.inference_mode(), self._autocast():
+                outputs = self.model(**inputs)
+
+                # Get sentence embeddings through mean pooling, still in inference mode
+                sentence_embeddings = _mean_pool(outputs.last_hidden_state, inputs['attention_mask'])
+            
+            # Move to CPU and convert to numpy
+            embedding = self._to_numpy(sentence_embeddings)
+            
+            # Clear some memory
+            del inputs, outputs, sentence_embeddings
+
+            self._cache_embedding(key, embedding[0])
+            return embedding[0], description_length # Return the single embedding array and length of description
+        
+        except Exception:
+            logger.exception(f"Error processing description for campaign {idx}")
+            return np.zeros(self.description_dim, dtype=np.float32), 0 # Return zero vector of appropriate size (768 for base Longformer)
+    
+
+    def process_riskandchallenges_embedding(self, campaign: Dict, idx: int) -> np.ndarray:
+        """
+        Process campaign risk and challenges text into numerical embeddings using MiniLM.
+
+        We use the MiniLM model (sentence-transformers/all-minilm-l6-v2) to process the
+        risk and challenges texts, as it is efficient for shorter text sequences and
+        good for semantic similarity tasks.
+
+        Args:
+            campaign: Dictionary containing campaign data
+            idx: Index of the campaign in the dataset (for error reporting)
+
+        Returns:
+            A 384-dimensional vector embedding of the risk and challenges text
+
+        Raises:
+            Various exceptions may be caught internally and handled by returning zero vectors
+        """
+        try:
+            return self._embed_minilm([campaign.get("risk", '')], 1, "risk")[0]
+
+        except Exception:
+            logger.exception(f"Error processing risk statement for campaign {idx}")
+            return np.zeros(384, dtype=np.float32) # Return zero vector of appropriate size for minilm
+
+    def process_blurb(self, campaign: Dict, idx: int) -> np.ndarray:
+        """
+        Process campaign blurb text into numerical embeddings using MiniLM.
+
+        We use the MiniLM model (sentence-transformers/all-minilm-l6-v2) to process
+        the blurb texts, as it is efficient for shorter text sequences and good for
+        semantic similarity tasks.
+
+        Args:
+            campaign: Dictionary containing campaign data
+            idx: Index of the campaign in the dataset (for error reporting)
+
+        Returns:
+            A 384-dimensional vector embedding of the blurb text
+
+        Raises:
+            Various exceptions may be caught internally and handled by returning zero vectors
+        """
+        try:
+            return self._embed_minilm([campaign.get("blurb", '')], 1, "blurb")[0]
+
+        except Exception:
+            logger.exception(f"Error processing blurb for campaign {idx}")
+            return np.zeros(384, dtype=np.float32) # Return zero vector of appropriate size for minilm
+
+
+    def _embed_minilm(self, texts: List[str], batch_size: int, label: str) -> np.ndarray:
+        """
+        Embed short texts (blurbs, risk statements) with MiniLM, using the embedding cache.
+
+        Blurbs and risk statements share the model, so they also share cache entries:
+        a text seen in either field is encoded only once.
+
+        Args:
+            texts: List of texts to embed
+            batch_size: Number of texts per forward pass
+            label: Name of the texts (for progress and error reporting)
+
+        Returns:
+            Array of shape (len(texts), 384) with one embedding per text
+        """
+        return self._cached_embeddings('minilm', texts, lambda new_texts: self._embed_batches(
+            new_texts, self.RiskandBlurb_tokenizer, self.RiskandBlurb_model, 512, 384, batch_size,
+            label, pad_to_multiple_of=SHORT_TEXT_PAD_MULTIPLE))
+
+
+    def _embed_batches(self, texts: List[str], tokenizer, model, max_length: int,
+                       dim: int, batch_size: int, label: str,
+                       pad_to_multiple_of: Optional[int] = None,
+                       max_batch_tokens: Optional[int] = None) -> np.ndarray:
+        """
+        Embed a list of texts in mini-batches using masked mean pooling.
+
+        Each mini-batch is tokenized and run through the model in a single forward
+        pass, which keeps the GPU busy instead of paying the tokenizer and kernel
+        launch overhead once per campaign. All texts are tokenized in a single call,
+        grouped by token length, and padded per batch; the results are returned in
+        the original order.
+
+        Args:
+            texts: List of texts to embed
+            tokenizer: Tokenizer matching the model
+            model: Transformer model producing last_hidden_state
+            max_length: Maximum number of tokens per text
+            dim: Dimension of the output embeddings
+            batch_size: Number of texts per forward pass
+            label: Name of the text field (for progress and error reporting)
+            pad_to_multiple_of: If set, pad each batch up to a multiple of this length
+            max_batch_tokens: If set, the maximum number of padded tokens per batch
+
+        Returns:
+            Array of shape (len(texts), dim) with one embedding per text; the rows
+            of texts whose mini-batch failed are NaN, see _embed_encoded()
+        """
+        if not texts:
+            return np.zeros((0, dim), dtype=np.float32)
+
+        # Encode each distinct text once (empty fields in particular are common)
+        first_seen: Dict[str, int] = {}
+        inverse = np.fromiter((first_seen.setdefault(text, len(first_seen)) for text in texts),
+                              dtype=np.intp, count=len(texts))
+
+        # Tokenize every text once, without padding
+        encoded = tokenizer(list(first_seen), truncation=True, max_length=max_length)
+        embeddings = self._embed_encoded(encoded, tokenizer, model, dim, batch_size, label,
+                                         pad_to_multiple_of=pad_to_multiple_of,
+                                         max_batch_tokens=max_batch_tokens)
+        return embeddings[inverse]
+
+
+    def _embed_encoded(self, encoded, tokenizer, model, dim: int, batch_size: int,
+                       label: str, pad_to_multiple_of: Optional[int] = None,
+                       max_batch_tokens: Optional[int] = None) -> np.ndarray:
+        """
+        Embed already tokenized (unpadded) sequences in length-sorted mini-batches.
+
+        Args:
+            encoded: Tokenizer output holding one list of token ids per sequence
+            tokenizer: Tokenizer used to pad each batch
+            model: Transformer model producing last_hidden_state
+            dim: Dimension of the output embeddings
+            batch_size: Number of sequences per forward pass
+            label: Name of the text field (for progress and error reporting)
+            pad_to_multiple_of: If set, pad each batch up to a multiple of this length
+            max_batch_tokens: If set, shrink batches of long sequences so that no
+                batch holds more than this many padded tokens
+
+        Returns:
+            Array of shape (number of sequences, dim) in the original sequence order.
+            The rows of sequences whose mini-batch failed are NaN, so that callers
+            can tell them apart from real embeddings (see _cached_embeddings())
+        """
+        num_sequences = len(encoded['input_ids'])
+        embeddings = np.full((num_sequences, dim), np.nan, dtype=np.float32)
+
+        # Visit sequences longest-first, so each mini-batch holds sequences of
+        # similar length and little compute is spent on padding. Starting with the
+        # longest batch also surfaces out-of-memory errors right away and lets the
+        # CUDA allocator reserve its peak block once for the later, smaller batches.
+        lengths = np.fromiter((len(ids) for ids in encoded['input_ids']), dtype=np.int64,
+                              count=num_sequences)
+        order = np.argsort(-lengths, kind='stable')
+        batch_indices = _split_batches(order, lengths, batch_size, max_batch_tokens, pad_to_multiple_of)
+
+        batches = self._prefetch_batches(encoded, tokenizer, batch_indices, pad_to_multiple_of)
+        for batch_idx, inputs in tqdm(batches, total=len(batch_indices),
+                                      desc=f"Embedding {label}", leave=False):
+            try:
+                if isinstance(inputs, Exception):
+                    raise inputs
+
+                # Move inputs to device
+                inputs = self._to_device(inputs)
+
+                with torch.inference_mode(), self._autocast():
+                    outputs = model(**inputs)
+
+                    # Get sentence embeddings through mean pooling, still in inference mode
+                    sentence_embeddings = _mean_pool(outputs.last_hidden_state, inputs['attention_mask'])
+
+                # Scatter rows back to the original (unsorted) positions
+                embeddings[batch_idx] = self._to_numpy(sentence_embeddings)
+
+            except Exception:
+                logger.exception(f"Error processing {label} at positions {batch_idx.tolist()}")
+
+        return embeddings
+
+
+    def _prefetch_batches(self, encoded, tokenizer, batch_indices: List[np.ndarray],
+                          pad_to_multiple_of: Optional[int] = None) -> Iterator[Tuple[np.ndarray, Any]]:
+        """
+        Pad mini-batches of pre-tokenized sequences on a background thread.
+
+        While the model runs on one batch, the next ones are padded (and pinned on
+        GPU) by a producer thread, so this CPU work is off the critical path. At
+        most PREFETCH_BATCHES batches are prepared ahead.
+
+        Args:
+            encoded: Tokenizer output holding one list of token ids per sequence
+            tokenizer: Tokenizer used to pad each batch
+            batch_indices: Positions of the sequences of each batch, in visiting order
+            pad_to_multiple_of: If set, pad each batch up to a multiple of this length
+
+        Yields:
+            Tuples of (positions of the batch's sequences, padded tensors), where the
+            tensors are replaced by the exception if padding the batch failed
+        """
+        batches = queue.Queue(maxsize=PREFETCH_BATCHES)
+        pin = self.device.type == 'cuda'
+
+        def produce():
+            for batch_idx in batch_indices:
+                try:
+                    # Pad the pre-tokenized batch to its longest member
+                    inputs = tokenizer.pad({k: [v[i] for i in batch_idx] for k, v in encoded.items()},
+                                           padding='longest',
+                                           pad_to_multiple_of=pad_to_multiple_of,
+                                           return_tensors="pt")
+                    if pin:
+                        inputs = {k: v.pin_memory() for k, v in inputs.items()}
+                except Exception as e:
+                    inputs = e
+                batches.put((batch_idx, inputs))
+            batches.put(None)
+
+        threading.Thread(target=produce, daemon=True).start()
+        while True:
+            batch = batches.get()
+            if batch is None:
+                return
+            yield batch
+
+
+    def _cached_embeddings(self, field: str, texts: List[str], encode) -> np.ndarray:
+        """
+        Look up texts in the embedding cache, encoding only the ones not seen before.
+
+        Campaigns often share boilerplate blurbs, risk statements or whole
+        descriptions (e.g. relaunches), so each distinct text of a field is encoded
+        once while it stays in the cache. Texts are keyed by a 128-bit BLAKE2b
+        digest, so long descriptions are not kept in memory as keys. The cache
+        holds at most EMBEDDING_CACHE_SIZE texts, evicting the least recently used.
+
+        Texts whose mini-batch failed to encode (NaN rows from encode) get zero
+        vectors and are not cached, so they are encoded again when next seen.
+
+        Args:
+            field: Cache namespace of the texts (the text field, or the model shared by several fields)
+            texts: List of texts to embed
+            encode: Function mapping a list of new texts to an array of embeddings
+
+        Returns:
+            Array with one embedding per text, in the order of texts
+        """
+        cache = self._embedding_cache
+        keys = [_text_key(field, text) for text in texts]
+
+        # Embeddings of the distinct texts, from the cache or encoded below
+        rows: Dict[Tuple[str, bytes], np.ndarray] = {}
+        new: Dict[Tuple[str, bytes], str] = {}
+        for key, text in zip(keys, texts):
+            if key in rows or key in new:
+                continue
+            cached = cache.get(key)
+            if cached is None:
+                new[key] = text
+            else:
+                cache.move_to_end(key)
+                rows[key] = cached
+
+        if new or not texts:
+            embeddings = encode(list(new.values()))
+            if not texts:
+                return embeddings
+            failed = np.isnan(embeddings).any(axis=1)
+            embeddings[failed] = 0
+            for key, embedding, is_failed in zip(new, embeddings, failed):
+                # Copy the row, so a cached entry does not keep the whole batch alive
+                rows[key] = embedding = embedding.copy()
+                if not is_failed:
+                    self._cache_embedding(key, embedding)
+        return np.stack([rows[key] for key in keys])
+
+
+    def _cache_embedding(self, key: Tuple[str, bytes], embedding: np.ndarray) -> None:
+        """
+        Add an embedding to the cache, evicting the least recently used beyond EMBEDDING_CACHE_SIZE.
+
+        Args:
+            key: Cache key of the text, see _text_key()
+            embedding: Embedding of the text
+        """
+        self._embedding_cache[key] = embedding
+        if len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+            self._embedding_cache.popitem(last=False)
+
+
+    def process_description_embeddings_batch(self, texts: List[str], batch_size: int = 16) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Process many campaign descriptions into embeddings.
+
+        Batched counterpart of process_description_embedding. Descriptions are fed to
+        the model in mini-batches rather than one campaign at a time.
+
+        Args:
+            texts: List of description texts
+            batch_size: Number of descriptions per forward pass
+
+        Returns:
+            Tuple containing:
+                - Array of shape (len(texts), self.description_dim) with the description embeddings
+                - Array of shape (len(texts),) with the description lengths (word count)
+        """
+        lengths = np.fromiter(map(_word_count, texts), dtype=np.int64, count=len(texts))
+        embeddings = self._cached_embeddings('description', texts,
+                                             lambda new_texts: self._encode_descriptions(new_texts, batch_size))
+        return embeddings, lengths
+
+
+    def _encode_descriptions(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """
+        Encode descriptions with the configured description encoder, without caching.
+
+        Args:
+            texts: List of description texts
+            batch_size: Number of descriptions per forward pass
+
+        Returns:
+            Array of shape (len(texts), self.description_dim), with NaN rows for
+            the texts whose mini-batch failed
+        """
+        if self.description_encoder == 'minilm':
+            return self._embed_windows(texts, batch_size)
+
+        # Longformer pads every input to a multiple of its attention window. Padding
+        # each length-bucketed batch to that size up front keeps the sequence only as
+        # long as the batch needs, and spares the model from re-padding it internally.
+        attention_window = self.model.config.attention_window
+        if not isinstance(attention_window, int):
+            attention_window = max(attention_window)
+
+        if self.description_encoder == 'longformer':
+            return self._embed_batches(texts, self.tokenizer, self.model, 4096, 768,
+                                       batch_size, "descriptions",
+                                       pad_to_multiple_of=attention_window,
+                                       max_batch_tokens=DESCRIPTION_BATCH_TOKENS)
+
+        # Hybrid: short descriptions go through the smaller model, and only the
+        # long ones through Longformer. Each model gets its own batches.
+        embeddings = np.zeros((len(texts), 768), dtype=np.float32)
+        if not texts:
+            return embeddings
+
+        encoded = self.tokenizer(texts, truncation=True, max_length=4096)
+        token_counts = np.array([len(ids) for ids in encoded['input_ids']])
+        short_idx = np.flatnonzero(token_counts <= SHORT_DESCRIPTION_MAX_TOKENS)
+        long_idx = np.flatnonzero(token_counts > SHORT_DESCRIPTION_MAX_TOKENS)
+
+        if len(short_idx):
+            embeddings[short_idx] = self._embed_batches([texts[i] for i in short_idx],
+                                                        self.short_tokenizer, self.short_model,
+                                                        SHORT_DESCRIPTION_MAX_TOKENS, 768,
+                                                        batch_size, "short descriptions",
+                                                        pad_to_multiple_of=SHORT_TEXT_PAD_MULTIPLE)
+        if len(long_idx):
+            long_encoded = {k: [v[i] for i in long_idx] for k, v in encoded.items()}
+            embeddings[long_idx] = self._embed_encoded(long_encoded, self.tokenizer, self.model,
+                                                       768, batch_size, "long descriptions",
+                                                       pad_to_multiple_of=attention_window,
+                                                       max_batch_tokens=DESCRIPTION_BATCH_TOKENS)
+        return embeddings
+
+
+    def _embed_windows(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """
+        Embed long texts with minilm by averaging over overlapping 512-token windows.
+
+        Each text is split into windows of at most 512 tokens that overlap by
+        DESCRIPTION_WINDOW_STRIDE tokens. All windows of all texts are embedded
+        together in length-sorted batches, then averaged back into one vector per text.
+
+        Args:
+            texts: List of texts to embed
+            batch_size: Number of windows per forward pass
+
+        Returns:
+            Array of shape (len(texts), 384) with one embedding per text, NaN for
+            the texts with a window whose mini-batch failed
+        """
+        if not texts:
+            return np.zeros((0, 384), dtype=np.float32)
+
+        encoded = self.RiskandBlurb_tokenizer(texts, truncation=True, max_length=512,
+                                              stride=DESCRIPTION_WINDOW_STRIDE,
+                                              return_overflowing_tokens=True)
+        window_to_text = np.asarray(encoded.pop('overflow_to_sample_mapping'))
+
+        window_embeddings = self._embed_encoded(encoded, self.RiskandBlurb_tokenizer,
+                                                self.RiskandBlurb_model, 384, batch_size,
+                                                "description windows",
+                                                pad_to_multiple_of=SHORT_TEXT_PAD_MULTIPLE)
+
+        # Average the window embeddings belonging to each text
+        sums = np.zeros((len(texts), 384), dtype=np.float32)
+        np.add.at(sums, window_to_text, window_embeddings)
+        counts = np.bincount(window_to_text, minlength=len(texts)).clip(min=1)
+        return sums / counts[:, None]
+
+
+    def process_risk_embeddings_batch(self, texts: List[str], batch_size: int = 16) -> np.ndarray:
+        """
+        Process many risk and challenges texts into embeddings using MiniLM.
+
+        Batched counterpart of process_riskandchallenges_embedding.
+
+        Args:
+            texts: List of risk and challenges texts
+            batch_size: Number of texts per forward pass
+
+        Returns:
+            Array of shape (len(texts), 384) with the risk embeddings
+        """
+        return self._embed_minilm(texts, batch_size, "risks")
+
+
+    def process_blurb_embeddings_batch(self, texts: List[str], batch_size: int = 16) -> np.ndarray:
+        """
+        Process many campaign blurbs into embeddings using MiniLM.
+
+        Batched counterpart of process_blurb.
+
+        Args:
+            texts: List of blurb texts
+            batch_size: Number of texts per forward pass
+
+        Returns:
+            Array of shape (len(texts), 384) with the blurb embeddings
+        """
+        return self._embed_minilm(texts, batch_size, "blurbs")
+
+
+    def precompute_text_embeddings(self, batch_size: int = 16, start: int = 0,
+                                   end: Optional[int] = None) -> None:
+        """
+        Batch-encode the descriptions, blurbs and risk statements of campaigns in self.data.
+
+        After this call, process_campaign looks up the precomputed embeddings by index
+        instead of running a forward pass per campaign. Only campaigns in
+        self.data[start:end] are encoded, which lets callers process a large dataset
+        in chunks with bounded memory; earlier precomputed embeddings are replaced.
+
+        Blurbs and risks are encoded together, as one set of MiniLM batches, on a
+        second thread while the descriptions are encoded, so the tokenization, padding
+        and Python work of one model overlaps with the GPU work of the other.
+
+        Args:
+            batch_size: Number of texts per forward pass
+            start: Index of the first campaign to encode
+            end: Index one past the last campaign to encode (defaults to all campaigns)
+        """
+        campaigns = self.data[start:end]
+        descriptions = [campaign.get("description", '') for campaign in campaigns]
+        blurbs = [campaign.get("blurb", '') for campaign in campaigns]
+        risks = [campaign.get("risk", '') for campaign in campaigns]
+
+        self.embedding_offset = start
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            short_texts = pool.submit(self._embed_minilm, blurbs + risks, batch_size, "blurbs and risks")
+            self.description_embeddings, self.description_lengths = \
+                self.process_description_embeddings_batch(descriptions, batch_size)
+            self.blurb_embeddings, self.risk_embeddings = np.split(short_texts.result(), [len(blurbs)])
+
+        if self.binary_embeddings:
+            # Cast each [N, H] matrix once, so every row is already a contiguous
+            # float16 view and encode_embedding only has to copy its bytes
+            self.description_embeddings = self.description_embeddings.astype('<f2')
+            self.blurb_embeddings = self.blurb_embeddings.astype('<f2')
+            self.risk_embeddings = self.risk_embeddings.astype('<f2')
+
+
+    def precompute_numeric_features(self, start: int = 0, end: Optional[int] = None) -> None:
+        """
+        Compute the plain numeric features of campaigns in self.data as NumPy columns.
+
+        Each field is gathered into one array and transformed in a single vectorized
+        pass, so process_campaign only has to index into the result. Missing or
+        invalid values become 0, as in the per-campaign methods. The one-hot category
+        matrix is built here as well.
+
+        Args:
+            start: Index of the first campaign to process
+            end: Index one past the last campaign to process (defaults to all campaigns)
+        """
+        campaigns = self.data[start:end]
+
+        # Log1p transformation with base 10 of all three money columns in one
+        # in-place pass, as in process_funding_goal and friends
+        amounts = np.stack([_numeric_column(campaigns, key, np.float64)
+                            for key in ('funding_goal', 'average_pledged', 'average_funding_goal')])
+        np.log1p(amounts, out=amounts)
+        amounts *= _LN10_INV
+
+        # Share of previous projects that succeeded, 0 where there were none, as in
+        # calculate_previous_sucess_rate
+        previous = _numeric_column(campaigns, 'previous_projects', np.float64)
+        successful = _numeric_column(campaigns, 'previous_successful_projects', np.float64)
+        success_rate = np.divide(successful, previous, out=np.zeros_like(successful),
+                                 where=(successful != 0) & (previous != 0))
+
+        self.numeric_offset = start
+        self.category_onehots = self.process_categories_batch(campaigns)
+        self.numeric_features = {
+            'funding_goal': amounts[0],
+            'previous_pledged': amounts[1],
+            'previous_funding_goal': amounts[2],
+            'image_count': _numeric_column(campaigns, 'image_count', np.int64),
+            'video_count': _numeric_column(campaigns, 'video_count', np.int64),
+            'campaign_duration': _numeric_column(campaigns, 'campaign_duration', np.int64),
+            'previous_projects_count': previous.astype(np.int64),
+            'previous_success_rate': success_rate,
+        }
+
+
+    def _precomputed_position(self, idx: int) -> Optional[int]:
+        """
+        Return the row of campaign idx in the precomputed embeddings, or None if the
+        campaign was not part of the last precompute_text_embeddings call.
+        """
+        if self.description_embeddings is None:
+            return None
+        pos = idx - self.embedding_offset
+        if 0 <= pos < len(self.description_embeddings):
+            return pos
+        return None
+
+
+    def _precomputed_numeric(self, idx: int) -> Optional[Dict[str, Any]]:
+        """
+        Return the precomputed numeric features of campaign idx as Python scalars, or
+        None if the campaign was not part of the last precompute_numeric_features call.
+        """
+        if self.numeric_features is None:
+            return None
+        pos = idx - self.numeric_offset
+        if not 0 <= pos < len(self.numeric_features['funding_goal']):
+            return None
+        numeric = {key: values[pos].item() for key, values in self.numeric_features.items()}
+        numeric['category_embedding'] = self.category_onehots[pos]
+        return numeric
+
+
+    def process_category(self, campaign: Dict) -> np.ndarray:
+        """
+        Process campaign category using one-hot encoding.
+
+        This method converts categorical data into binary vectors where each position
+        corresponds to a unique category, with 1 indicating the category of the campaign
+        and 0 elsewhere.
+
+        Args:
+            campaign: Dictionary containing campaign data
+
+        Returns:
+            int8 array of 0s and 1s representing the one-hot encoded category
+
+        Raises:
+            Various exceptions may be caught internally and handled by returning zero vectors
+        """
+        try:
+            category = campaign.get('category', '')
+            # Look up the one-hot row of the category
+            return self.category_eye[self.cat_to_idx.get(category, self.num_categories)].copy()
+
+        except Exception:
+            logger.exception("Error processing category")
+            return np.zeros(self.num_categories, dtype=np.int8)  # Return all zeros if error
+
+
+    def process_categories_batch(self, campaigns: List[Dict]) -> np.ndarray:
+        """
+        One-hot encode the categories of many campaigns at once.
+
+        Batched counterpart of process_category, gathering all rows in a single
+        indexing operation.
+
+        Args:
+            campaigns: List of campaign dictionaries
+
+        Returns:
+            Array of shape (len(campaigns), num_categories) of 0s and 1s
+        """
+        indices = np.fromiter((self.cat_to_idx.get(campaign.get('category', ''), self.num_categories)
+                               for campaign in campaigns),
+                              dtype=np.intp, count=len(campaigns))
+        return self.category_eye[indices]
+
+
+    def _glove_embedding(self, text: str) -> np.ndarray:
+        """
+        Average the GloVe vectors of the words in a short, normalized text.
+
+        Args:
+            text: Lowercased, stripped text (e.g. a subcategory or country name)
+
+        Returns:
+            A 100-dimensional vector, or zeros if no word is in the GloVe vocabulary
+        """
+        if not text:
+            return np.zeros(100)
+
+        # Tokenize the text by simple whitespace split and look up the row of every
+        # word in the GloVe vocabulary, skipping unknown words
+        ids = [i for i in (self.glove_k2i.get(word) for word in text.split()) if i is not None]
+
+        if not ids:
+            return np.zeros(100)
+
+        # Average the word vectors
+        return self.glove_vecs[ids].mean(axis=0)
+
+
+    def _glove_embeddings_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Average the GloVe vectors of the words in many texts with one sparse product.
+
+        Batched counterpart of _glove_embedding. The texts are turned into a sparse
+        (len(texts), V) matrix whose rows hold 1/n for each of the n in-vocabulary
+        words (repeated words accumulate), which multiplied with the (V, 100) GloVe
+        matrix gives all averages at once.
+
+        Args:
+            texts: Lowercased, stripped texts
+
+        Returns:
+            Array of shape (len(texts), 100), with zero rows for texts without any
+            word in the GloVe vocabulary
+        """
+        indptr = [0]
+        indices = []
+        data = []
+        for text in texts:
+            ids = [i for i in (self.glove_k2i.get(word) for word in text.split()) if i is not None]
+            if ids:
+                indices.extend(ids)
+                data.extend([1.0 / len(ids)] * len(ids))
+            indptr.append(len(indices))
+
+        weights = sparse.csr_matrix((np.asarray(data, dtype=np.float32), indices, indptr),
+                                    shape=(len(texts), len(self.glove_vecs)))
+        return np.asarray(weights @ self.glove_vecs)
+
+
+    def precompute_glove_embeddings(self, start: int = 0, end: Optional[int] = None) -> None:
+        """
+        Embed the not yet cached subcategories and countries of campaigns in self.data.
+
+        All new texts are embedded in one sparse matrix product per field and stored in
+        the caches that process_subcategory_embedding and process_country_embedding
+        read from.
+
+        Args:
+            start: Index of the first campaign to process
+            end: Index one past the last campaign to process (defaults to all campaigns)
+        """
+        campaigns = self.data[start:end]
+        for key, cache in (('subcategory', self._subcat_cache), ('country', self._country_cache)):
+            values = (campaign.get(key, '') for campaign in campaigns)
+            texts = [text for text in dict.fromkeys(value.lower().strip() for value in values
+                                                    if isinstance(value, str))
+                     if text not in cache]
+            if texts:
+                cache.update(zip(texts, self._glove_embeddings_batch(texts)))
+
+
+    def process_subcategory_embedding(self, campaign: Dict, idx: int) -> np.ndarray:
+        """
+        Process campaign subcategory text into numerical embeddings using GloVe.
+
+        We use the GloVe embeddings (glove-wiki-gigaword-100), which captures 
+        semantic relationships between words, to process subcategory text.
+
+        Args:
+            campaign: Dictionary containing campaign data
+            idx: Index of the campaign in the dataset (for error reporting)
+
+        Returns:
+            A 100-dimensional vector embedding of the subcategory
+
+        Raises:
+            Various exceptions may be caught internally and handled by returning zero vectors
+        """
+        try:
+            text = campaign.get('subcategory', '').lower().strip()
+
+            # Subcategories repeat across campaigns, so embed each one only once
+            if text not in self._subcat_cache:
+                self._subcat_cache[text] = self._glove_embedding(text)
+            return self._subcat_cache[text]
+
+        except Exception:
+            logger.exception(f"Error processing subcategory for campaign {idx}")
+            return np.zeros(100)
+
+
+
+    def process_country_embedding(self, campaign: Dict, idx: int) -> np.ndarray:
+        """
+        Process campaign country information into numerical embeddings using GloVe.
+
+        We use the GloVe embeddings (glove-wiki-gigaword-100), which captures 
+        semantic relationships between words, to process country names.
+
+        Args:
+            campaign: Dictionary containing campaign data
+            idx: Index of the campaign in the dataset (for error reporting)
+
+        Returns:
+            A 100-dimensional vector embedding of the country
+
+        Raises:
+            Various exceptions may be caught internally and handled by returning zero vectors
+        """
+        try:
+            text = campaign.get('country', '').lower().strip()
+
+            # Countries repeat across campaigns, so embed each one only once
+            if text not in self._country_cache:
+                self._country_cache[text] = self._glove_embedding(text)
+            return self._country_cache[text]
+
+        except Exception:
+            logger.exception(f"Error processing country for campaign {idx}")
+            return np.zeros(100)
+
+        
+    def process_funding_goal(self, campaign: Dict, idx: int) -> float:
+        """
+        Process campaign funding goal with logarithmic compression.
+
+        Applies Log1p transformation with base 10 to compress extreme values while
+        preserving relative differences between funding goals.
+
+        Args:
+            campaign: Dictionary containing campaign data
+            idx: Index of the campaign in the dataset (for error reporting)
+
+        Returns:
+            Float representing the transformed funding goal
+
+        Raises:
+            Various exceptions may be caught internally and handled by returning zero
+        """
+        try:
+            #Log1p transformation, it is good for general compression while preserving relative differences
+            return _log10p(campaign.get('funding_goal', 0))
+            
+        except Exception:
+            logger.exception(f"Error processing funding goal for campaign {idx}")
+            return 0.0
+        
+    
+    def process_previous_funding_goal(self, campaign: Dict, idx: int) -> float:
+        """
+        Process previous campaign funding goal with logarithmic compression.
+
+        Applies Log1p transformation with base 10 to compress extreme values while
+        preserving relative differences between previous funding goals.
+
+        Args:
+            campaign: Dictionary containing campaign data
+            idx: Index of the campaign in the dataset (for error reporting)
+
+        Returns:
+            Float representing the transformed previous funding goal
+
+        Raises:
+            Various exceptions may be caught internally and handled by returning zero
+        """
+        try:
+            #Log1p transformation, it is good for general compression while preserving relative differences
+            return _log10p(campaign.get('average_funding_goal', 0))
+            
+        except Exception:
+            logger.exception(f"Error processing previous funding goal for campaign {idx}")
+            return 0.0
+        
+
+    def process_previous_pledged(self, campaign: Dict, idx: int) -> float:
+        """
+        Process previous campaign pledged amount with logarithmic compression.
+
+        Applies Log1p transformation with base 10 to compress extreme values while
+        preserving relative differences between previous pledged amounts.
+
+        Args:
+            campaign: Dictionary containing campaign data
+            idx: Index of the campaign in the dataset (for error reporting)
+
+        Returns:
+            Float representing the transformed previous pledged amount
+
+        Raises:
+            Various exceptions may be caught internally and handled by returning zero
+        """
+        try:
+            #Log1p transformation, it is good for general compression while preserving relative differences
+            return _log10p(campaign.get('average_pledged', 0))
+            
+        except Exception:
+            logger.exception(f"Error processing pledge amount for campaign {idx}")
+            return 0.0
+    
+
+    def calculate_previous_sucess_rate(self, campaign: Dict, idx: int) -> float:
+        """
+        Calculate success rate of creator's previous campaigns.
+
+        Computes the ratio of successful previous projects to total previous projects.
+
+        Args:
+            campaign: Dictionary containing campaign data
+            idx: Index of the campaign in the dataset (for error reporting)
+
+        Returns:
+            Float between 0.0 and 1.0 representing the previous success rate
+
+        Raises:
+            Various exceptions may be caught internally and handled by returning zero
+        """
+        try:
+            previousProjects= float(campaign.get('previous_projects', 0))
+            previousSuccessfulProjects = float(campaign.get('previous_successful_projects', 0))
+            if previousSuccessfulProjects == 0.0:
+                return 0.0
+            else:
+                previous_success_rate =  previousSuccessfulProjects/ previousProjects
+                return  previous_success_rate 
+            
+        except Exception:
+            logger.exception(f"Error calculating previous success rate for campaign {idx}")
+            return 0.0
+    
+
+    def encode_embedding(self, embedding: np.ndarray) -> Any:
+        """
+        Convert an embedding vector into the form stored in the processed output.
+
+        By default the vector itself is kept: orjson serializes NumPy arrays directly,
+        so no Python float is created per element. With binary_embeddings enabled, the
+        vector is stored as base64-encoded little-endian float16 bytes, which is
+        roughly 8x smaller than the JSON list. Use decode_embedding to read either
+        form back.
+
+        Args:
+            embedding: 1-dimensional embedding vector
+
+        Returns:
+            Contiguous float32 array, or a base64 string when binary_embeddings is enabled
+        """
+        if self.binary_embeddings:
+            return base64.b64encode(np.ascontiguousarray(embedding, dtype='<f2').tobytes()).decode('ascii')
+        return np.ascontiguousarray(embedding, dtype=np.float32)
+
+
+    def process_campaign(self, campaign: Dict, idx: int) -> Dict[str, Any]:
+        """
+        Process all features for a single campaign.
+
+        This is the main method that orchestrates the extraction and transformation of
+        all features for a campaign, combining text embeddings and numerical features
+        into a single dictionary ready for machine learning models.
+
+        Args:
+            campaign: Dictionary containing raw campaign data
+            idx: Index of the campaign in the dataset (for error reporting)
+
+        Returns:
+            Dictionary containing the campaign ID and all processed features
+
+        Raises:
+            Various exceptions are handled in the individual processing methods
+        """
+
+        pos = self._precomputed_position(idx)
+        if pos is not None:
+            description_embedding = self.description_embeddings[pos]
+            description_length = int(self.description_lengths[pos])
+            blurb_embedding = self.blurb_embeddings[pos]
+            risk_embedding = self.risk_embeddings[pos]
+        else:
+            description_embedding, description_length = self.process_description_embedding(campaign, idx)
+            blurb_embedding = self.process_blurb(campaign, idx)
+            risk_embedding = self.process_riskandchallenges_embedding(campaign, idx)
+
+        numeric = self._precomputed_numeric(idx)
+        if numeric is None:
+            numeric = {
+                'category_embedding': self.process_category(campaign),
+                'funding_goal': self.process_funding_goal(campaign, idx),
+                'image_count': int(campaign['image_count']) if 'image_count' in campaign else 0,  # Access from campaign
+                'video_count': int(campaign['video_count']) if 'video_count' in campaign else 0,
+                'campaign_duration': int(campaign['campaign_duration']) if 'campaign_duration' in campaign else 0,  # Access from campaign
+                'previous_projects_count': int(campaign['previous_projects']) if 'previous_projects' in campaign else 0,
+                'previous_success_rate': self.calculate_previous_sucess_rate(campaign, idx),
+                'previous_pledged': self.process_previous_pledged(campaign, idx),
+                'previous_funding_goal': self.process_previous_funding_goal(campaign, idx),
+            }
+
+        return {
+            'id': campaign.get('id', str(idx)),
+            'description_embedding': self.encode_embedding(description_embedding),
+            'description_length': description_length,
+            'blurb_embedding': self.encode_embedding(blurb_embedding),
+            'risk_embedding': self.encode_embedding(risk_embedding),
+            'category_embedding': numeric['category_embedding'],
+            'subcategory_embedding': self.encode_embedding(self.process_subcategory_embedding(campaign, idx)),
+            'country_embedding': self.encode_embedding(self.process_country_embedding(campaign, idx)),
+            'funding_goal': numeric['funding_goal'],
+            'image_count': numeric['image_count'],
+            'video_count': numeric['video_count'],
+            'campaign_duration': numeric['campaign_duration'],
+            'previous_projects_count': numeric['previous_projects_count'],
+            'previous_success_rate': numeric['previous_success_rate'],
+            'previous_pledged': numeric['previous_pledged'],
+            'previous_funding_goal': numeric['previous_funding_goal'],
+            'state': campaign['state'] if 'state' in campaign else 0
+        }
+
+def decode_embedding(value: Any) -> np.ndarray:
+    """
+    Read back an embedding written by CampaignProcessor.encode_embedding.
+
+    Args:
+        value: List of floats or base64-encoded float16 string
+
+    Returns:
+        The embedding as a float32 vector
+    """
+    if isinstance(value, str):
+        return np.frombuffer(base64.b64decode(value), dtype='<f2').astype(np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+def iter_processed_campaigns(processor: CampaignProcessor, chunk_size: int = WRITE_CHUNK_SIZE,
+                             batch_size: int = 16) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Process the processor's campaigns in chunks, yielding each chunk when done.
+
+    Texts are batch-encoded one chunk at a time, so memory use is bounded by the
+    chunk size rather than by the size of the whole dataset.
+
+    Args:
+        processor: CampaignProcessor holding the campaigns in its data attribute
+        chunk_size: Number of campaigns per yielded chunk
+        batch_size: Number of texts per forward pass
+
+    Yields:
+        Lists of processed campaign dictionaries, in dataset order
+    """
+    total_campaigns = len(processor.data)
+    for start in range(0, total_campaigns, chunk_size):
+        end = min(start + chunk_size, total_campaigns)
+        yield process_chunk(processor, start, end, batch_size)
+
+
+def process_chunk(processor: CampaignProcessor, start: int, end: int,
+                  batch_size: int = 16) -> List[Dict[str, Any]]:
+    """
+    Process the campaigns in the range [start, end) of the processor's data.
+
+    Args:
+        processor: CampaignProcessor holding the campaigns in its data attribute
+        start: Index of the first campaign to process
+        end: Index one past the last campaign to process
+        batch_size: Number of texts per forward pass
+
+    Returns:
+        List of processed campaign dictionaries, in dataset order
+    """
+    processor.precompute_text_embeddings(batch_size, start, end)
+    processor.precompute_numeric_features(start, end)
+    processor.precompute_glove_embeddings(start, end)
+    return [processor.process_campaign(processor.data[idx], idx) for idx in range(start, end)]
+
+
+# CampaignProcessor of the current worker process, built once by _init_worker
+_worker_processor: Optional[CampaignProcessor] = None
+
+
+def _init_worker(data: List[Dict], processor_kwargs: Dict[str, Any],
+                 devices: Any, num_threads: int) -> None:
+    """Bind a worker process to its device and build its CampaignProcessor."""
+    global _worker_processor
+    device = devices.get()
+    if device is not None:
+        # CUDA is not initialized yet in a spawned worker, so this restricts it to one GPU
+        os.environ['CUDA_VISIBLE_DEVICES'] = device
+    torch.set_num_threads(num_threads)
+    _worker_processor = CampaignProcessor(data=data, **processor_kwargs)
+
+
+def _process_chunk_in_worker(start: int, end: int, batch_size: int) -> List[Dict[str, Any]]:
+    return process_chunk(_worker_processor, start, end, batch_size)
+
+
+def iter_processed_campaigns_parallel(data: List[Dict], num_workers: int,
+                                      chunk_size: int = WRITE_CHUNK_SIZE, batch_size: int = 16,
+                                      **processor_kwargs) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Process campaigns chunk by chunk across several worker processes.
+
+    Each worker builds its own CampaignProcessor once and is given whole chunks to
+    process. With GPUs available, the workers are assigned to them round-robin;
+    otherwise the CPU threads are split evenly between the workers, so they do not
+    oversubscribe the cores. At most CHUNKS_IN_FLIGHT_PER_WORKER chunks per worker
+    are submitted ahead of the chunk being consumed, so processed chunks waiting
+    to be written stay bounded.
+
+    Args:
+        data: List of campaign dictionaries
+        num_workers: Number of worker processes
+        chunk_size: Number of campaigns per yielded chunk
+        batch_size: Number of texts per forward pass
+        **processor_kwargs: Keyword arguments passed on to each CampaignProcessor
+
+    Yields:
+        Lists of processed campaign dictionaries, in dataset order
+    """
+    # Spawn rather than fork, as a forked child cannot use CUDA or safely reuse torch's thread pools
+    context = multiprocessing.get_context('spawn')
+    visible = os.environ.get('CUDA_VISIBLE_DEVICES')
+    gpus = visible.split(',') if visible else [str(i) for i in range(torch.cuda.device_count())]
+    devices = context.Queue()
+    for rank in range(num_workers):
+        devices.put(gpus[rank % len(gpus)] if gpus else None)
+    num_threads = max(1, (os.cpu_count() or 1) // num_workers)
+
+    max_in_flight = num_workers * CHUNKS_IN_FLIGHT_PER_WORKER
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=context, initializer=_init_worker,
+                             initargs=(data, processor_kwargs, devices, num_threads)) as pool:
+        pending = deque()
+        for start in range(0, len(data), chunk_size):
+            pending.append(pool.submit(_process_chunk_in_worker, start,
+                                       min(start + chunk_size, len(data)), batch_size))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_campaigns(output_file_path: str, chunks: queue.Queue) -> None:
+    """
+    Write chunks of processed campaigns from a queue into a single JSON array, with
+    one compact campaign record per line.
+
+    Intended to run on a background thread. Chunks (lists of processed campaign
+    dictionaries) are consumed until a None sentinel is received. If writing fails,
+    the remaining chunks are still drained so the producer never blocks.
+
+    If output_file_path ends in .jsonl, the campaigns are written as JSON Lines
+    instead: one compact record per line, which can be read back one campaign at
+    a time without loading the whole file.
+
+    Args:
+        output_file_path: Path of the JSON (or JSON Lines) file to write
+        chunks: Queue of processed campaign lists, terminated by None
+    """
+    done = False
+    try:
+        if output_file_path.endswith('.jsonl'):
+            with open(output_file_path, 'wb') as f:
+                while True:
+                    chunk = chunks.get()
+                    if chunk is None:
+                        done = True
+                        break
+                    for processed_campaign in chunk:
+                        f.write(orjson.dumps(processed_campaign,
+                                             option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE))
+            print(f"Successfully saved processed campaigns to {output_file_path}")
+            return
+
+        with open(output_file_path, 'wb') as f:
+            f.write(b'[')
+            first = True
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    done = True
+                    break
+                for processed_campaign in chunk:
+                    f.write(b'\n' if first else b',\n')
+                    # Compact records: indenting would roughly triple the size of the
+                    # embedding lists, one number per line
+                    f.write(orjson.dumps(processed_campaign, option=orjson.OPT_SERIALIZE_NUMPY))
+                    first = False
+            f.write(b'\n]')
+        print(f"Successfully saved processed campaigns to {output_file_path}")
+    except Exception:
+        logger.exception("Error saving to file")
+        while not done:
+            done = chunks.get() is None
+
+
+def campaigns_to_arrays(processed_campaigns: List[Dict[str, Any]],
+                        embedding_dtype=np.float16) -> Dict[str, np.ndarray]:
+    """
+    Turn processed campaign dictionaries into one NumPy array per feature.
+
+    Embeddings become (N, D) matrices of embedding_dtype, category one-hots an
+    (N, C) matrix, and ids and scalar features 1-dimensional arrays, all in the
+    order of processed_campaigns. Storing embeddings as float16 halves their size
+    again compared to float32, at a precision well beyond what the models resolve.
+
+    Args:
+        processed_campaigns: Non-empty list of dictionaries from process_campaign
+        embedding_dtype: NumPy dtype of the embedding matrices
+
+    Returns:
+        Dictionary mapping each feature name to its array
+    """
+    arrays = {}
+    for key in processed_campaigns[0]:
+        values = [processed_campaign[key] for processed_campaign in processed_campaigns]
+        if key.endswith('_embedding') and key != 'category_embedding':
+            arrays[key] = np.stack([decode_embedding(value) for value in values]).astype(embedding_dtype)
+        else:
+            arrays[key] = np.asarray(values)
+    return arrays
+
+
+def write_campaign_arrays(output_file_path: str, chunks: queue.Queue) -> None:
+    """
+    Write chunks of processed campaigns from a queue into a compressed .npz file.
+
+    Counterpart of write_campaigns that stores one array per feature (see
+    campaigns_to_arrays; embeddings as float16) instead of one JSON object per
+    campaign, which is both smaller and directly loadable as matrices with np.load.
+
+    Args:
+        output_file_path: Path of the .npz file to write
+        chunks: Queue of processed campaign lists, terminated by None
+    """
+    done = False
+    try:
+        # Convert each chunk as it arrives, so only arrays are kept in memory
+        chunk_arrays = []
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                done = True
+                break
+            if chunk:
+                chunk_arrays.append(campaigns_to_arrays(chunk))
+
+        arrays = {key: np.concatenate([part[key] for part in chunk_arrays])
+                  for key in (chunk_arrays[0] if chunk_arrays else {})}
+        np.savez_compressed(output_file_path, **arrays)
+        print(f"Successfully saved processed campaigns to {output_file_path}")
+    except Exception:
+        logger.exception("Error saving to file")
+        while not done:
+            done = chunks.get() is None
+
+
+def main():
+    """
+    Main function to process campaign data and save the results.
+
+    This function:
+    1. Loads campaign data from a JSON file
+    2. Initializes the CampaignProcessor
+    3. Processes all campaigns chunk by chunk, batch-encoding the description, blurb and risk texts
+    4. Saves the processed data to a new JSON file on a background writer thread
+    5. Reports processing statistics
+
+    The function includes progress tracking and error handling for the processing pipeline.
+    """
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+
+    #start_time = time.time()
+    
+    # Load campaign data
+    file_path = "Data/pre_inputdata.json"
+    with open(file_path, 'rb') as file:
+        campaigns_dict = orjson.loads(file.read())
+
+    # Convert dictionary to list of campaigns, adding ID as a field
+    campaigns = []
+    for campaign_id, campaign_data in campaigns_dict.items():
+        campaign_data["id"] = campaign_id
+        campaigns.append(campaign_data)
+
+    # On GPU the models are compiled, which costs some time up front but pays off
+    # over a full dataset run. With several GPUs, or NUM_WORKERS set for a CPU run,
+    # the chunks are spread over worker processes with one processor each.
+    compile_models = torch.cuda.is_available()
+    num_workers = NUM_WORKERS or max(torch.cuda.device_count(), 1)
+
+    # Serialize processed campaigns on a background thread, so JSON encoding and
+    # disk writes overlap with processing instead of blocking at the end. Use a
+    # .jsonl path to write JSON Lines, or an .npz path to store one array per
+    # feature instead of JSON records.
+    output_file_path = "allProcessed.json"
+    write = write_campaign_arrays if output_file_path.endswith('.npz') else write_campaigns
+    chunks = queue.Queue(maxsize=4)
+    writer = threading.Thread(target=write, args=(output_file_path, chunks))
+    writer.start()
+
+    # Process all campaigns chunk by chunk with progress tracking, so only one
+    # chunk of tokenized texts and embeddings is held in memory at a time
+    processed_count = 0
+    total_campaigns = len(campaigns)
+    print(f"\nStarting to process {total_campaigns} campaigns...")
+
+    if num_workers > 1:
+        processed_chunks = iter_processed_campaigns_parallel(
+            campaigns, num_workers, chunk_size=WRITE_CHUNK_SIZE, batch_size=32,
+            compile_models=compile_models)
+    else:
+        # Initialize processor with embeddings
+        processor = CampaignProcessor(data=campaigns,  # final_embeddings from your previous code
+                                      compile_models=compile_models)
+        processed_chunks = iter_processed_campaigns(processor, chunk_size=WRITE_CHUNK_SIZE,
+                                                    batch_size=32)
+
+    for chunk in processed_chunks:
+        chunks.put(chunk)
+        processed_count += len(chunk)
+        print(f"Processed {processed_count}/{total_campaigns} campaigns")
+
+    chunks.put(None)
+    writer.join()
+
+
+    #end_time = time.time()
+    #execution_time = end_time - start_time
+    #print(f"Total execution time: {execution_time:.2f} seconds")
+    #print(f"Average time per campaign: {execution_time/total_campaigns:.2f} seconds")
+
+if __name__ == "__main__":
+    main()
+
     
\ No newline at end of file
@@ -1,12 +1,17 @@
 """Analyze Kickstarter project data for backer funding patterns and top funded campaigns."""
 
-import json
 import argparse
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+import ijson
+import numpy as np
+import pandas as pd
+
+from convert_db_to_parquet import projects_to_frame, COLUMNS
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -16,6 +21,9 @@ logger = logging.getLogger(__name__)
 
 # Default paths and constants
 INPUT_FILE = "Data/website_database.json"
+# Columnar copy of INPUT_FILE, written by convert_db_to_parquet.py; used when it
+# is present and not older than INPUT_FILE
+PARQUET_FILE = "Data/website_database.parquet"
 END_DATE = datetime(2024, 12, 12).timestamp()
 TIME_PERIODS = {
     '7d': 7,
@@ -39,50 +47,89 @@ def format_date(timestamp: float) -> str:
     """Format timestamp as dd/mm/yyyy."""
     return datetime.fromtimestamp(timestamp).strftime('%d/%m/%Y')
 
-def analyze_backer_funding(projects: List[Dict], category: Optional[str] = None) -> Tuple[List[str], List[float]]:
+def load_projects(args: argparse.Namespace) -> pd.DataFrame:
+    """Load the projects in the requested timeframe and category as a DataFrame."""
+    start_time = None
+    if args.timeframe != 'N/A':
+        days = TIME_PERIODS[args.timeframe]
+        start_time = END_DATE - (days * 24 * 60 * 60)
+
+    category = args.category.lower() if args.category else None
+
+    use_parquet = Path(PARQUET_FILE).exists()
+    if use_parquet and Path(INPUT_FILE).exists() \
+            and Path(PARQUET_FILE).stat().st_mtime < Path(INPUT_FILE).stat().st_mtime:
+        logger.warning(f"{PARQUET_FILE} is older than {INPUT_FILE}, reading the JSON instead. "
+                       "Rerun Tools/convert_db_to_parquet.py to update it.")
+        use_parquet = False
+
+    if use_parquet:
+        # Read only the analysed columns of the projects in the timeframe
+        filters = [('cal_deadline', '>=', start_time), ('cal_deadline', '<=', END_DATE)] if start_time is not None else None
+        df = pd.read_parquet(PARQUET_FILE, columns=COLUMNS, filters=filters)
+
+        # Filter by category if specified
+        if category:
+            df = df[df['category'].str.lower() == category]
+        return df
+
+    # Stream the JSON database, filtering by timeframe and category while parsing,
+    # so only the matching projects are ever held in memory
+    with open(INPUT_FILE, 'rb') as f:
+        return projects_to_frame(
+            p for p in ijson.items(f, 'item', use_float=True)
+            if (start_time is None or start_time <= p['cal_deadline'] <= END_DATE)
+            and (category is None or p['category'].lower() == category))
+
+def analyze_backer_funding(projects: pd.DataFrame, category: Optional[str] = None) -> Tuple[List[str], List[float]]:
     """Calculate average funding per backer for each category or subcategory."""
-    funding_data: Dict[str, Dict[str, float]] = {}
-    
-    for p in projects:
-        # Use subcategory if a specific category is provided, otherwise use main category
-        cat = p['subcategory'] if category else p['category'].title()
-        backers = p['backers_count']
-        if backers > 0:  # Only consider projects with backers
-            if cat not in funding_data:
-                funding_data[cat] = {'total_funds': 0, 'total_backers': 0}
-            funding_data[cat]['total_funds'] += p['pledged_usd']
-            funding_data[cat]['total_backers'] += backers
-    
+    projects = projects[projects['backers_count'] > 0]  # Only consider projects with backers
+
+    # Use subcategory if a specific category is provided, otherwise use main category.
+    # Categories are coded in order of first appearance; main categories are
+    # title-cased once per distinct name rather than once per project.
+    codes, cats = pd.factorize(projects['subcategory'] if category else projects['category'],
+                               use_na_sentinel=False)
+    if not category:
+        title_codes, cats = pd.factorize(cats.str.title())
+        codes = title_codes[codes]
+
+    # Sum funds and backers per category in one pass each
+    total_funds = np.bincount(codes, weights=projects['pledged_usd'].to_numpy(), minlength=len(cats))
+    total_backers = np.bincount(codes, weights=projects['backers_count'].to_numpy(), minlength=len(cats))
+
     # Calculate averages and sort by funding per backer
-    averages = [(cat, data['total_funds'] / data['total_backers']) 
-                for cat, data in funding_data.items()]
-    averages.sort(key=lambda x: x[1], reverse=True)
-    
-    # Split into separate lists
-    categories, funding = zip(*averages) if averages else ([], [])
-    return list(categories), list(funding)
-
-def find_top_funded_projects(projects: List[Dict], category: Optional[str] = None, top_n: int = 5) -> List[Dict]:
+    averages = total_funds / total_backers
+    order = np.argsort(-averages, kind='stable')
+    return cats[order].tolist(), averages[order].tolist()
+
+def find_top_funded_projects(projects: pd.DataFrame, category: Optional[str] = None, top_n: int = 5) -> List[Dict]:
     """Find the top funded projects overall or within a specific category."""
     if category:
-        projects = [p for p in projects if p['category'].lower() == category.lower()]
-    
-    # Track unique project IDs to avoid duplicates
-    seen_ids = set()
-    unique_projects = []
-    
-    # Sort projects by pledged amount in descending order
-    sorted_projects = sorted(projects, key=lambda x: float(x['pledged_usd']), reverse=True)
-    
-    # Get top N unique projects
-    for project in sorted_projects:
-        if project['id'] not in seen_ids:
-            seen_ids.add(project['id'])
-            unique_projects.append(project)
-            if len(unique_projects) == top_n:
-                break
-    
-    return unique_projects
+        projects = projects[projects['category'].str.lower() == category.lower()]
+
+    pledged = projects['pledged_usd'].to_numpy()
+    ids = projects['id'].to_numpy()
+    n = len(pledged)
+
+    # Only the best funded rows can make the top N, so partition out a few
+    # candidates (with room for duplicate IDs) and sort just those. The candidate
+    # set is widened in the rare case it holds fewer than top_n unique projects.
+    k = min(top_n * 4, n)
+    while True:
+        threshold = np.partition(pledged, n - k)[n - k] if k else np.inf
+        candidates = np.flatnonzero(pledged >= threshold)  # All ties at the threshold, in dataset order
+
+        # Sort candidates by pledged amount in descending order, keeping the first
+        # (best funded) row of each project ID to avoid duplicates
+        candidates = candidates[np.argsort(-pledged[candidates], kind='stable')]
+        _, first = np.unique(ids[candidates], return_index=True)
+        top = candidates[np.sort(first)][:top_n]
+        if len(top) == top_n or k == n:
+            break
+        k = min(k * 2, n)
+
+    return projects.iloc[top].to_dict('records')
 
 def display_backer_metrics(categories: List[str], averages: List[float], category: Optional[str] = None):
     """Display average funding per backer for each category."""
@@ -106,29 +153,17 @@ def display_top_projects(projects: List[Dict]) -> None:
         print(f"   Total Pledged: ${pledged:,.2f}")
         print(f"   Backers: {backers:,}")
         print(f"   Average Pledge: ${avg_pledge:.2f}")
-        print(f"   URL: {project['links']['project']}")
+        print(f"   URL: {project['url']}")
         print()
 
 def analyze_projects(args: argparse.Namespace):
     """Analyze projects based on command line arguments."""
     try:
-        # Load project data
-        with open(INPUT_FILE, 'r') as f:
-            projects = json.load(f)
-        
-        # Filter projects by timeframe
-        if args.timeframe != 'N/A':
-            days = TIME_PERIODS[args.timeframe]
-            start_time = END_DATE - (days * 24 * 60 * 60)
-            projects = [p for p in projects if start_time <= p['cal_deadline'] <= END_DATE]
-        
-        # Filter by category if specified
-        if args.category:
-            category_projects = [p for p in projects if p['category'].lower() == args.category.lower()]
-            if not category_projects:
-                logger.error(f"No projects found for category: {args.category}")
-                return
-            projects = category_projects
+        # Load project data, filtered by timeframe and category
+        projects = load_projects(args)
+        if args.category and projects.empty:
+            logger.error(f"No projects found for category: {args.category}")
+            return
         
         # Calculate average funding per backer
         categories, averages = analyze_backer_funding(projects, args.category)
@@ -2,12 +2,12 @@
 Kickstarter Duplicate Project Detector and Remover
 
 This module identifies and removes duplicate projects from raw Kickstarter data.
-It implements a multi-layered approach to detect duplicates using various identifiers
-such as project IDs, names, URLs, and creator information.
+Projects are identified as duplicates by their project ID; the first occurrence
+of each ID is kept.
 
 Key features:
 - Efficient line-by-line processing of large JSON files
-- Multi-key duplicate detection (ID, name, URL, creator)
+- Memory use bounded by the number of distinct project IDs
 - Comprehensive statistics collection about duplicates
 - Detailed reporting on duplicate groups
 
@@ -20,14 +20,18 @@ Usage:
 Copyright (c) 2025 Angus Fung
 """
 
+import sys
 import json
 import logging
+import orjson
 import argparse
 from pathlib import Path
-from collections import defaultdict
-from typing import Dict, List, Set
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterator, List, Tuple, Union
 from datetime import datetime
 
+from line_ranges import map_ranges, read_range
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -40,6 +44,11 @@ DEFAULT_INPUT_FILE = Path("/Users/Angusf777/Desktop/FYP OFFICIAL/Data/Kickstarte
 DEFAULT_OUTPUT_FILE = Path("/Users/Angusf777/Desktop/FYP OFFICIAL/Data/Kickstarter_removed_duplicates.json")
 DEFAULT_STATS_FILE = Path("/Users/Angusf777/Desktop/FYP OFFICIAL/Data/duplicate_stats.json")
 
+# Size of the byte ranges scanned by each worker process
+SCAN_CHUNK_BYTES = 64 * 1024 * 1024
+# Buffer size for reading and writing the (multi-GB) data files
+IO_BUFFER_BYTES = 1024 * 1024
+
 def parse_arguments():
     """
     Parse command line arguments for the check_duplicates script.
@@ -54,37 +63,33 @@ def parse_arguments():
                       help='Path to output deduplicated JSON file')
     parser.add_argument('--stats', type=Path, default=DEFAULT_STATS_FILE,
                       help='Path to output statistics JSON file')
+    parser.add_argument('--workers', type=int, default=1,
+                      help='Number of processes scanning the input (default: 1)')
     return parser.parse_args()
 
 class DuplicateProcessor:
     """
     Handles the processing and removal of duplicate projects in Kickstarter data.
     
-    This class maintains multiple tracking maps to identify duplicates based on
-    different attributes (ID, name, URL, creator) and collects detailed statistics
+    This class counts the occurrences of each project ID to identify duplicates,
+    without retaining the projects themselves, and collects detailed statistics
     about the duplicates found.
     
     Attributes:
-        id_map: Dictionary mapping project IDs to lists of project data
-        name_map: Dictionary mapping project names to lists of project data
-        url_map: Dictionary mapping project URLs to lists of project data  
-        creator_map: Dictionary mapping creator IDs to lists of project data
-        seen_ids: Set of project IDs already processed
+        id_counts: Counter mapping each project ID seen so far to its number of occurrences
+        states: States of the kept projects, tallied into by_state when finalizing
         duplicate_stats: Dictionary containing statistics about duplicates
     """
     
     def __init__(self):
-        self.id_map: Dict[str, List[Dict]] = defaultdict(list)
-        self.name_map: Dict[str, List[Dict]] = defaultdict(list)
-        self.url_map: Dict[str, List[Dict]] = defaultdict(list)
-        self.creator_map: Dict[str, List[Dict]] = defaultdict(list)
-        self.seen_ids: Set[str] = set()
+        self.id_counts: Counter = Counter()
+        self.states: List[str] = []
         self.duplicate_stats = {
             'total_projects': 0,
             'duplicates_removed': 0,
             'unique_projects': 0,
             'by_category': defaultdict(int),
-            'by_state': defaultdict(int),
+            'by_state': {},
             'duplicate_groups': []
         }
     
@@ -93,7 +98,8 @@ class DuplicateProcessor:
         Process a project and determine if it's a duplicate.
         
         This method examines each project and determines if it should be kept
-        or discarded based on whether its ID has been seen before.
+        or discarded based on whether its ID has been seen before. Every
+        occurrence is counted, so duplicate groups can be reported at the end.
         
         Args:
             project: Project data dictionary
@@ -101,70 +107,63 @@ class DuplicateProcessor:
         Returns:
             bool: True if project should be kept, False if it's a duplicate
         """
-        project_id = project.get('data', {}).get('id')
-        if not project_id:
-            return True  # Keep projects without IDs
-            
-        if project_id in self.seen_ids:
-            self.duplicate_stats['duplicates_removed'] += 1
-            return False
-            
-        self.seen_ids.add(project_id)
-        self._update_maps(project)
-        return True
+        data = project.get('data', {})
+        state = data.get('state')
+        return self._record(data.get('id'), sys.intern(state) if isinstance(state, str) else state)
     
-    def _update_maps(self, project: Dict) -> None:
+    def process_line(self, line: bytes) -> bool:
         """
-        Update tracking maps with project information.
+        Process a raw JSON line and determine if it's a duplicate.
         
-        This method adds the project to various tracking maps based on
-        its ID, name, URL, and creator information to facilitate
-        duplicate detection and statistics collection.
+        Every line is decoded, so a malformed line is reported as a decode error
+        rather than counted as a duplicate, as it is when scan_lines() decodes it.
         
         Args:
-            project: Project data dictionary
+            line: One JSON-encoded project record
+            
+        Returns:
+            bool: True if project should be kept, False if it's a duplicate
+            
+        Raises:
+            orjson.JSONDecodeError: If the line is not valid JSON
         """
-        data = project.get('data', {})
-        project_id = data.get('id')
-        project_name = data.get('name', '').lower()
-        project_url = data.get('urls', {}).get('web', {}).get('project', '').lower()
-        creator_id = data.get('creator', {}).get('id')
-        state = data.get('state')
-        
-        if project_id:
-            self.id_map[project_id].append(project)
-        if project_name:
-            self.name_map[project_name].append(project)
-        if project_url:
-            self.url_map[project_url].append(project)
-        if creator_id:
-            self.creator_map[creator_id].append(project)
-        if state:
-            self.duplicate_stats['by_state'][state] += 1
+        return self.process_project(orjson.loads(line))
     
-    def _extract_project_info(self, project: Dict) -> Dict:
+    def process_scanned(self, project_id, state) -> bool:
         """
-        Extract relevant project information for reporting.
+        Process a project whose line was already decoded by scan_lines().
         
-        This method extracts key attributes from a project for inclusion
-        in the duplicate statistics report.
+        Args:
+            project_id: ID of the project, if any
+            state: State of the project, if any
+            
+        Returns:
+            bool: True if project should be kept, False if it's a duplicate
+        """
+        return self._record(project_id, state)
+    
+    def _record(self, project_id, state) -> bool:
+        """
+        Count an occurrence of a project and update the statistics.
         
         Args:
-            project: Project data dictionary
+            project_id: ID of the project, if any
+            state: State of the project, if any
             
         Returns:
-            Dict: Dictionary containing key project attributes
+            bool: True if project should be kept, False if it's a duplicate
         """
-        data = project.get('data', {})
-        return {
-            'id': data.get('id'),
-            'name': data.get('name'),
-            'state': data.get('state'),
-            'creator_id': data.get('creator', {}).get('id'),
-            'url': data.get('urls', {}).get('web', {}).get('project'),
-            'launched_at': data.get('launched_at'),
-            'deadline': data.get('deadline')
-        }
+        if not project_id:
+            return True  # Keep projects without IDs
+            
+        self.id_counts[project_id] += 1
+        if self.id_counts[project_id] > 1:
+            self.duplicate_stats['duplicates_removed'] += 1
+            return False
+            
+        if state:
+            self.states.append(state)
+        return True
     
     def finalize_stats(self) -> Dict:
         """
@@ -177,37 +176,80 @@ class DuplicateProcessor:
             Dict: Dictionary containing comprehensive statistics about duplicates
         """
         # Process duplicate groups
-        for project_id, projects in self.id_map.items():
-            if len(projects) > 1:
+        for project_id, occurrences in self.id_counts.items():
+            if occurrences > 1:
                 self.duplicate_stats['duplicate_groups'].append({
                     'project_id': project_id,
-                    'occurrences': len(projects),
-                    'projects': [self._extract_project_info(p) for p in projects]
+                    'occurrences': occurrences
                 })
                 self.duplicate_stats['by_category']['exact_duplicates'] += 1
         
         # Calculate final statistics
-        self.duplicate_stats['unique_projects'] = len(self.seen_ids)
+        self.duplicate_stats['unique_projects'] = len(self.id_counts)
         self.duplicate_stats['analysis_timestamp'] = datetime.now().isoformat()
         
-        # Convert defaultdict to regular dict for JSON serialization
+        # Tally states in one pass and convert to regular dicts for JSON serialization
         self.duplicate_stats['by_category'] = dict(self.duplicate_stats['by_category'])
-        self.duplicate_stats['by_state'] = dict(self.duplicate_stats['by_state'])
+        self.duplicate_stats['by_state'] = dict(Counter(self.states))
         
         return self.duplicate_stats
 
-def remove_duplicates(input_file: Path, output_file: Path, stats_file: Path) -> None:
+def _scan_chunk(input_file: Path, start: int, end: int) -> List[Union[Tuple[Any, Any], Exception]]:
+    """
+    Decode each line starting in the byte range [start, end) and read its project ID and state.
+    
+    Args:
+        input_file: Path to input JSON file containing raw Kickstarter data
+        start: Offset of the first byte of the range
+        end: Offset one past the last byte of the range
+        
+    Returns:
+        List: One (project_id, state) tuple per line, with None where not found, or
+        the exception raised if the line could not be decoded
+    """
+    loads = orjson.loads
+    scanned = []
+    for line in read_range(input_file, start, end):
+        try:
+            data = loads(line).get('data', {})
+            state = data.get('state')
+            scanned.append((data.get('id'), sys.intern(state) if isinstance(state, str) else state))
+        except Exception as e:
+            scanned.append(e)
+    return scanned
+
+def scan_lines(input_file: Path, workers: int) -> Iterator[Union[Tuple[Any, Any], Exception]]:
+    """
+    Decode every line of a file in parallel and read its project ID and state.
+    
+    The file is split into byte ranges that worker processes decode, so only
+    the deduplication itself runs in the main process.
+    
+    Args:
+        input_file: Path to input JSON file containing raw Kickstarter data
+        workers: Number of worker processes
+        
+    Yields:
+        Tuple: (project_id, state) of each line in file order, with None where not
+        found, or the exception raised if the line could not be decoded
+    """
+    for scanned in map_ranges(_scan_chunk, input_file, workers, range_bytes=SCAN_CHUNK_BYTES):
+        yield from scanned
+
+def remove_duplicates(input_file: Path, output_file: Path, stats_file: Path, workers: int = 1) -> None:
     """
     Main function to remove duplicates from Kickstarter data and save statistics.
     
     This function processes the input file line by line, identifying and removing
     duplicate projects, and saves both the deduplicated data and statistics about
-    the duplicates found.
+    the duplicates found. With several workers, the lines are scanned for their
+    ID and state in parallel, see scan_lines().
     
     Args:
         input_file: Path to input JSON file containing raw Kickstarter data
         output_file: Path to output deduplicated JSON file
         stats_file: Path to output statistics JSON file
+        workers: Number of processes scanning the input
     """
     processor = DuplicateProcessor()
     
@@ -215,14 +257,22 @@ def remove_duplicates(input_file: Path, output_file: Path, stats_file: Path) ->
         logger.info("Starting duplicate removal process...")
         
         # Process input file and write deduplicated data
-        with open(input_file, 'r') as f_in, open(output_file, 'w') as f_out:
-            for line in f_in:
+        with open(input_file, 'rb', buffering=IO_BUFFER_BYTES) as f_in, \
+                open(output_file, 'wb', buffering=IO_BUFFER_BYTES) as f_out:
+            write = f_out.write
+            if workers > 1:
+                lines = zip(f_in, scan_lines(input_file, workers))
+            else:
+                lines = ((line, None) for line in f_in)
+            for line, scanned in lines:
                 processor.duplicate_stats['total_projects'] += 1
                 try:
-                    project = json.loads(line.strip())
-                    if processor.process_project(project):
-                        f_out.write(json.dumps(project) + '\n')
-                except json.JSONDecodeError as e:
+                    if isinstance(scanned, Exception):
+                        raise scanned
+                    if processor.process_line(line) if scanned is None else processor.process_scanned(*scanned):
+                        # Kept lines are copied as-is rather than re-encoded
+                        write(line if line.endswith(b'\n') else line + b'\n')
+                except orjson.JSONDecodeError as e:
                     logger.error(f"Error decoding JSON at line {processor.duplicate_stats['total_projects']}: {e}")
                 except Exception as e:
                     logger.error(f"Error processing project at line {processor.duplicate_stats['total_projects']}: {e}")
@@ -249,4 +299,4 @@ def remove_duplicates(input_file: Path, output_file: Path, stats_file: Path) ->
 
 if __name__ == "__main__":
     args = parse_arguments()
-    remove_duplicates(args.input, args.output, args.stats) 
\ No newline at end of file
+    remove_duplicates(args.input, args.output, args.stats, args.workers) 
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Website Database Parquet Converter
+
+This module converts the web-friendly project database produced by
+make_WebDatabase.py into a columnar Parquet file. The analysis tools read only
+the columns they need from it, instead of decoding the whole JSON database into
+one dictionary per project on every run.
+
+The conversion only needs to be rerun when the JSON database changes.
+
+Usage:
+    python Tools/convert_db_to_parquet.py [--input INPUT_FILE] [--output OUTPUT_FILE]
+
+Copyright (c) 2025 Angus Fung
+"""
+
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import ijson
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Default paths
+DEFAULT_INPUT_FILE = Path("Data/website_database.json")
+DEFAULT_OUTPUT_FILE = Path("Data/website_database.parquet")
+
+# Columns kept for the analysis tools
+COLUMNS = ['id', 'name', 'category', 'subcategory', 'backers_count', 'pledged_usd', 'cal_deadline', 'url']
+# Columns with few distinct values
+LOW_CARDINALITY_COLUMNS = ('category', 'subcategory')
+
+def parse_arguments():
+    """
+    Parse command line arguments for the convert_db_to_parquet script.
+
+    Returns:
+        argparse.Namespace: Object containing the parsed command line arguments
+    """
+    parser = argparse.ArgumentParser(description='Convert the website database to Parquet.')
+    parser.add_argument('--input', type=Path, default=DEFAULT_INPUT_FILE,
+                      help='Path to input website database JSON file')
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT_FILE,
+                      help='Path to output Parquet file')
+    return parser.parse_args()
+
+def projects_to_frame(projects: Iterable[Dict]) -> pd.DataFrame:
+    """
+    Build a DataFrame with one column per analysed field from an iterable of projects.
+
+    The projects are consumed one at a time, so they can be streamed from the
+    JSON database without holding every project record in memory.
+
+    Args:
+        projects: Project records as written by make_WebDatabase.py
+
+    Returns:
+        pd.DataFrame: One row per project, with the columns listed in COLUMNS
+    """
+    columns: Dict[str, List] = {column: [] for column in COLUMNS}
+    fields = [(column, columns[column].append) for column in COLUMNS
+              if column != 'url' and column not in LOW_CARDINALITY_COLUMNS]
+    append_url = columns['url'].append
+
+    # Categories repeat across many projects, so each distinct name is stored once
+    # (like sys.intern, but also covering missing values) instead of once per project
+    names: Dict = {}
+    intern = names.setdefault
+    interned = [(column, columns[column].append) for column in LOW_CARDINALITY_COLUMNS]
+
+    for p in projects:
+        for column, append in fields:
+            append(p.get(column))
+        for column, append in interned:
+            value = p.get(column)
+            append(intern(value, value))
+        append_url(p.get('links', {}).get('project'))
+    # Text columns are typed explicitly, as pandas would make them float64 when there are no projects
+    return pd.DataFrame(columns).astype({'name': 'object', 'category': 'object', 'subcategory': 'object',
+                                         'backers_count': 'int64', 'pledged_usd': 'float64',
+                                         'cal_deadline': 'float64', 'url': 'object'})
+
+def convert_database(input_file: Path, output_file: Path) -> None:
+    """
+    Convert the JSON website database into a Parquet file.
+
+    Args:
+        input_file: Path to input website database JSON file
+        output_file: Path to output Parquet file
+    """
+    try:
+        logger.info(f"Loading projects from {input_file}...")
+        with open(input_file, 'rb') as f:
+            df = projects_to_frame(ijson.items(f, 'item', use_float=True))
+        df.to_parquet(output_file, index=False)
+        logger.info(f"Saved {len(df):,} projects to {output_file}")
+
+    except Exception as e:
+        logger.error(f"Error converting database: {e}")
+        raise
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    convert_database(args.input, args.output)
@@ -15,6 +15,7 @@ Key features:
 
 Usage:
     python Tools/filter_kickstarter.py [--input INPUT_FILE] [--output OUTPUT_FILE] [--stats STATS_FILE]
+                                       [--workers N]
 
 The script outputs both the filtered data and comprehensive statistics about the
 filtering process, which are used by visualization tools to explain the methodology.
@@ -22,12 +23,14 @@ filtering process, which are used by visualization tools to explain the methodol
 Copyright (c) 2025 Angus Fung
 """
 
-import json
 import logging
+import orjson
 import argparse
-from typing import Tuple, Optional, Dict, Any
-from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 from pathlib import Path
+from collections import Counter
+
+from line_ranges import map_ranges, merge_stats, read_range
 
 # Configure logging
 logging.basicConfig(
@@ -41,8 +44,10 @@ DEFAULT_INPUT_FILE = Path("/Users/Angusf777/Desktop/FYP OFFICIAL/Data/Kickstarte
 DEFAULT_OUTPUT_FILE = Path("/Users/Angusf777/Desktop/FYP OFFICIAL/Data/Kickstarter_filtered.json")
 DEFAULT_STATS_FILE = Path("/Users/Angusf777/Desktop/FYP OFFICIAL/Data/filtering_stats.json")
 
-EXCLUDED_STATES = {'suspended', 'started', 'live', 'submitted'}
+EXCLUDED_STATES = frozenset({'suspended', 'started', 'live', 'submitted'})
+INCLUDED_STATES = frozenset({'successful', 'failed'})  # States kept as-is
 CONVERSION_THRESHOLD = 60  # Percentage threshold for converting canceled to failed
+IO_BUFFER_BYTES = 4 * 1024 * 1024  # Read/write buffer size for the multi-GB data files
 
 def parse_arguments():
     """
@@ -58,6 +63,8 @@ def parse_arguments():
                       help='Path to output filtered JSON file')
     parser.add_argument('--stats', type=Path, default=DEFAULT_STATS_FILE,
                       help='Path to output statistics JSON file')
+    parser.add_argument('--workers', type=int, default=1,
+                      help='Number of processes filtering the input (default: 1)')
     return parser.parse_args()
 
 class ProjectProcessor:
@@ -87,24 +94,16 @@ class ProjectProcessor:
             The calculation uses the formula:
             (time_until_deadline / total_duration) * 100
         """
-        try:
-            deadline_dt = datetime.fromtimestamp(deadline)
-            canceled_dt = datetime.fromtimestamp(canceled_at)
-            created_dt = datetime.fromtimestamp(created_at)
-            
-            total_duration = (deadline_dt - created_dt).total_seconds()
-            time_until_deadline = (deadline_dt - canceled_dt).total_seconds()
-            
-            if total_duration > 0:
-                return (time_until_deadline / total_duration) * 100
-            return 0
-            
-        except Exception as e:
-            logger.error(f"Error calculating time percentage: {e}")
-            return 0
+        # The timestamps are Unix seconds, so the durations are plain differences
+        total_duration = deadline - created_at
+        if total_duration > 0:
+            return ((deadline - canceled_at) / total_duration) * 100
+        return 0
 
     @staticmethod
-    def should_include_project(project: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, Any]], str]:
+    def should_include_project(project: Dict[str, Any],
+                               state: Optional[str] = None
+                               ) -> Tuple[bool, Optional[Dict[str, Any]], str, Optional[float]]:
         """
         Determine if a project should be included in the filtered dataset.
         
@@ -117,18 +116,22 @@ class ProjectProcessor:
         
         Args:
             project: Project data dictionary
+            state: Lowercased project state, if the caller has already looked it up
             
         Returns:
             Tuple containing:
             - bool: Whether to include the project
             - Optional[Dict]: Modified project data if included, None if excluded
             - str: Reason for the decision (for statistics)
+            - Optional[float]: Percentage of time remaining for canceled projects
+              with valid timestamps, None otherwise
         """
         try:
-            state = project.get('data', {}).get('state', '').lower()
+            if state is None:
+                state = ((project.get('data') or {}).get('state') or '').lower()
             
             if state in EXCLUDED_STATES:
-                return False, None, state
+                return False, None, state, None
                 
             if state == 'canceled':
                 project_data = project.get('data', {})
@@ -143,112 +146,183 @@ class ProjectProcessor:
                     
                     if remaining_time <= CONVERSION_THRESHOLD:
                         project['data']['state'] = 'failed'
-                        return True, project, f"canceled_converted_{remaining_time:.1f}%"
-                    return False, None, f"canceled_excluded_{remaining_time:.1f}%"
-                return False, None, "canceled_invalid_timestamps"
+                        return True, project, "canceled_converted", remaining_time
+                    return False, None, "canceled_excluded", remaining_time
+                return False, None, "canceled_invalid_timestamps", None
                 
-            if state in {'successful', 'failed'}:
-                return True, project, state
+            if state in INCLUDED_STATES:
+                return True, project, state, None
                 
-            return False, None, f"unknown_state_{state}"
+            return False, None, f"unknown_state_{state}", None
             
         except Exception as e:
             logger.error(f"Error processing project: {e}")
-            return False, None, "error_processing"
+            return False, None, "error_processing", None
 
-def filter_projects(input_file: Path, output_file: Path, stats_file: Path) -> None:
+def new_stats() -> Dict[str, Any]:
     """
-    Main function to filter and process Kickstarter projects.
+    Create an empty statistics dictionary for the filtering process.
     
-    Reads projects from the input file, processes each one according to
-    filtering rules, and saves the filtered results to the output file.
-    Also collects and saves comprehensive statistics about the filtering process.
-    
-    Args:
-        input_file: Path to input JSON file containing raw Kickstarter data
-        output_file: Path to output filtered JSON file
-        stats_file: Path to output statistics JSON file
+    Returns:
+        Dict: Statistics with every counter at zero
     """
-    stats = {
+    return {
         'summary': {'total_processed': 0, 'included': 0, 'excluded': 0},
-        'by_state': {},
+        'by_state': Counter(),
         'canceled': {
             'total': 0,
             'converted_to_failed': 0,
             'excluded_early': 0,
             'invalid_timestamps': 0,
-            'by_time_remaining': {}
+            # Keyed by the percentage of time remaining, rounded to one decimal
+            'by_time_remaining': Counter()
         }
     }
+
+def filter_project(project: Dict[str, Any], stats: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Apply the filtering rules to a single project and count it in the statistics.
     
-    try:
-        with open(input_file, 'r') as infile, open(output_file, 'w') as outfile:
-            for line in infile:
-                stats['summary']['total_processed'] += 1
-                
-                try:
-                    project = json.loads(line.strip())
-                    state = project.get('data', {}).get('state', '').lower()
-                    
-                    stats['by_state'][state] = stats['by_state'].get(state, 0) + 1
-                    
-                    if state == 'canceled':
-                        stats['canceled']['total'] += 1
-                    
-                    should_include, modified_project, reason = ProjectProcessor.should_include_project(project)
-                    
-                    if should_include:
-                        json.dump(modified_project, outfile)
-                        outfile.write('\n')
-                        stats['summary']['included'] += 1
-                        
-                        if reason.startswith('canceled_converted'):
-                            stats['canceled']['converted_to_failed'] += 1
-                            time_remaining = float(reason.split('_')[2].rstrip('%'))
-                            bucket = f"{time_remaining:.1f}%"
-                            stats['canceled']['by_time_remaining'][bucket] = \
-                                stats['canceled']['by_time_remaining'].get(bucket, 0) + 1
-                    else:
-                        stats['summary']['excluded'] += 1
-                        if reason.startswith('canceled_excluded'):
-                            stats['canceled']['excluded_early'] += 1
-                            time_remaining = float(reason.split('_')[2].rstrip('%'))
-                            bucket = f"{time_remaining:.1f}%"
-                            stats['canceled']['by_time_remaining'][bucket] = \
-                                stats['canceled']['by_time_remaining'].get(bucket, 0) + 1
-                        elif reason == 'canceled_invalid_timestamps':
-                            stats['canceled']['invalid_timestamps'] += 1
-                    
-                except json.JSONDecodeError as e:
-                    logger.error(f"Error decoding JSON: {e}")
-                except Exception as e:
-                    logger.error(f"Error processing line: {e}")
+    Args:
+        project: Parsed project record, as read from a line of the raw data
+        stats: Statistics dictionary to update, see new_stats()
         
-        # Sort statistics
-        stats['by_state'] = dict(sorted(stats['by_state'].items()))
-        stats['canceled']['by_time_remaining'] = dict(sorted(
-            stats['canceled']['by_time_remaining'].items(),
-            key=lambda x: float(x[0].rstrip('%'))
-        ))
+    Returns:
+        Optional[Dict]: The project to write to the filtered data, or None if excluded
+    """
+    state = ((project.get('data') or {}).get('state') or '').lower()
+    
+    stats['by_state'][state] += 1
+    
+    if state == 'canceled':
+        stats['canceled']['total'] += 1
+    
+    should_include, modified_project, reason, remaining_time = \
+        ProjectProcessor.should_include_project(project, state)
+    
+    if should_include:
+        stats['summary']['included'] += 1
         
-        # Save statistics
-        with open(stats_file, 'w') as f:
-            json.dump(stats, f, indent=2)
+        if reason == 'canceled_converted':
+            stats['canceled']['converted_to_failed'] += 1
+            stats['canceled']['by_time_remaining'][round(remaining_time, 1)] += 1
+        return modified_project
+    
+    stats['summary']['excluded'] += 1
+    if reason == 'canceled_excluded':
+        stats['canceled']['excluded_early'] += 1
+        stats['canceled']['by_time_remaining'][round(remaining_time, 1)] += 1
+    elif reason == 'canceled_invalid_timestamps':
+        stats['canceled']['invalid_timestamps'] += 1
+    return None
+
+def _filter_lines(lines: Iterable[bytes], write: Callable[[bytes], Any], stats: Dict[str, Any]) -> None:
+    """
+    Filter projects line by line, writing the included ones and updating the statistics.
+    
+    Args:
+        lines: JSON lines, one project per line
+        write: Callable receiving each included project as a JSON line
+        stats: Statistics dictionary to update, see new_stats()
+    """
+    # Bind the per-line lookups once, outside the loop
+    loads = orjson.loads
+    dumps = orjson.dumps
+    
+    for line in lines:
+        stats['summary']['total_processed'] += 1
+        
+        try:
+            modified_project = filter_project(loads(line), stats)
+            if modified_project is not None:
+                write(dumps(modified_project, option=orjson.OPT_APPEND_NEWLINE))
+            
+        except Exception as e:
+            # Covers malformed JSON (orjson.JSONDecodeError) and unexpected record shapes
+            logger.error(f"Error processing line: {e}")
+
+def _filter_chunk(input_file: Path, start: int, end: int) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    Filter the projects on the lines starting in the byte range [start, end).
+    
+    Args:
+        input_file: Path to input JSON file containing raw Kickstarter data
+        start: Offset of the first byte of the range
+        end: Offset one past the last byte of the range
+        
+    Returns:
+        Tuple containing:
+        - bytes: The included projects as JSON lines
+        - Dict: Statistics for the range
+    """
+    stats = new_stats()
+    output = []
+    _filter_lines(read_range(input_file, start, end), output.append, stats)
+    return b''.join(output), stats
+
+def save_stats(stats: Dict[str, Any], stats_file: Path) -> None:
+    """
+    Sort the filtering statistics, save them to a file and log a summary.
+    
+    Args:
+        stats: Statistics collected while filtering, see new_stats()
+        stats_file: Path to output statistics JSON file
+    """
+    # Sort statistics
+    stats['by_state'] = dict(sorted(stats['by_state'].items()))
+    stats['canceled']['by_time_remaining'] = {
+        f"{time_remaining:.1f}%": count
+        for time_remaining, count in sorted(stats['canceled']['by_time_remaining'].items())
+    }
+    
+    # Save statistics
+    with open(stats_file, 'wb') as f:
+        f.write(orjson.dumps(stats, option=orjson.OPT_INDENT_2))
+    
+    logger.info("\nFiltering completed!")
+    logger.info(f"Total processed: {stats['summary']['total_processed']}")
+    logger.info(f"Included: {stats['summary']['included']}")
+    logger.info(f"Excluded: {stats['summary']['excluded']}")
+    logger.info("\nCanceled projects summary:")
+    logger.info(f"Total canceled: {stats['canceled']['total']}")
+    logger.info(f"Converted to failed: {stats['canceled']['converted_to_failed']}")
+    logger.info(f"Excluded (>60% remaining): {stats['canceled']['excluded_early']}")
+    logger.info(f"Invalid timestamps: {stats['canceled']['invalid_timestamps']}")
+    logger.info(f"\nDetailed statistics saved to: {stats_file}")
+
+def filter_projects(input_file: Path, output_file: Path, stats_file: Path, workers: int = 1) -> None:
+    """
+    Main function to filter and process Kickstarter projects.
+    
+    Reads projects from the input file, processes each one according to
+    filtering rules, and saves the filtered results to the output file.
+    Also collects and saves comprehensive statistics about the filtering process.
+    With several workers, byte ranges of the input are filtered by worker
+    processes and their output is written in file order.
+    
+    Args:
+        input_file: Path to input JSON file containing raw Kickstarter data
+        output_file: Path to output filtered JSON file
+        stats_file: Path to output statistics JSON file
+        workers: Number of processes filtering the input
+    """
+    stats = new_stats()
+    
+    try:
+        with open(output_file, 'wb', buffering=IO_BUFFER_BYTES) as outfile:
+            if workers > 1:
+                for output, chunk_stats in map_ranges(_filter_chunk, input_file, workers):
+                    outfile.write(output)
+                    merge_stats(stats, chunk_stats)
+            else:
+                with open(input_file, 'rb', buffering=IO_BUFFER_BYTES) as infile:
+                    _filter_lines(infile, outfile.write, stats)
         
-        logger.info("\nFiltering completed!")
-        logger.info(f"Total processed: {stats['summary']['total_processed']}")
-        logger.info(f"Included: {stats['summary']['included']}")
-        logger.info(f"Excluded: {stats['summary']['excluded']}")
-        logger.info("\nCanceled projects summary:")
-        logger.info(f"Total canceled: {stats['canceled']['total']}")
-        logger.info(f"Converted to failed: {stats['canceled']['converted_to_failed']}")
-        logger.info(f"Excluded (>60% remaining): {stats['canceled']['excluded_early']}")
-        logger.info(f"Invalid timestamps: {stats['canceled']['invalid_timestamps']}")
-        logger.info(f"\nDetailed statistics saved to: {stats_file}")
+        save_stats(stats, stats_file)
         
     except Exception as e:
         logger.error(f"Fatal error during filtering: {e}")
 
 if __name__ == "__main__":
     args = parse_arguments()
-    filter_projects(args.input, args.output, args.stats) 
\ No newline at end of file
+    filter_projects(args.input, args.output, args.stats, args.workers) 
\ No newline at end of file
@@ -1,16 +1,28 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+"""
+Chrome User Agent
 
-# Set up Chrome options
-chrome_options = Options()
-chrome_options.add_argument('--headless')
+This module provides the Chrome user agent string used for HTTP requests. Chrome
+reports a fixed user agent per major version (the minor, build and patch numbers
+are always 0.0.0), so the string is kept as a constant instead of being read from
+a headless browser. Update CHROME_UA when moving to a new Chrome major version.
 
-# Create a new Chrome driver instance
-driver = webdriver.Chrome(options=chrome_options)
+Usage:
+    python Tools/get_user_agent.py
 
-# Get the user agent
-user_agent = driver.execute_script("return navigator.userAgent")
-print("Your Chrome User Agent:", user_agent)
+Copyright (c) 2025 Angus Fung
+"""
 
-# Don't forget to close the driver
-driver.quit() 
\ No newline at end of file
+CHROME_UA = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+             "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36")
+
+def get_user_agent() -> str:
+    """
+    Get the Chrome user agent string.
+
+    Returns:
+        str: User agent reported by desktop Chrome on macOS
+    """
+    return CHROME_UA
+
+if __name__ == "__main__":
+    print("Your Chrome User Agent:", get_user_agent())
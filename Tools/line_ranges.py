@@ -0,0 +1,95 @@
+"""
+Parallel Line Range Processing
+
+This module holds the helpers shared by the Tools scripts that process the
+multi-GB JSON lines data files in worker processes. The input file is split
+into byte ranges, each worker reads the lines starting in its range, and the
+results are returned in file order, so the output matches a single-process run.
+
+Copyright (c) 2025 Angus Fung
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Default size of the input byte ranges handed to each worker process
+RANGE_BYTES = 16 * 1024 * 1024
+# Read buffer size for the lines of a range
+READ_BUFFER_BYTES = 4 * 1024 * 1024
+# Ranges submitted per worker ahead of the one being consumed
+RANGES_IN_FLIGHT_PER_WORKER = 2
+
+def read_range(input_file: Path, start: int, end: int) -> Iterator[bytes]:
+    """
+    Yield the lines of a file that start in the byte range [start, end).
+
+    Args:
+        input_file: Path to the JSON lines file
+        start: Offset of the first byte of the range
+        end: Offset one past the last byte of the range
+
+    Yields:
+        bytes: Each line starting in the range
+    """
+    with open(input_file, 'rb', buffering=READ_BUFFER_BYTES) as f:
+        position = start
+        if start:
+            # Skip the rest of the line that started in the previous range
+            f.seek(start - 1)
+            position += len(f.readline()) - 1
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line
+
+def map_ranges(function: Callable[..., Any], input_file: Path, workers: int, *args: Any,
+               range_bytes: Optional[int] = None) -> Iterator[Any]:
+    """
+    Apply a function to consecutive byte ranges of a file in worker processes.
+
+    At most RANGES_IN_FLIGHT_PER_WORKER ranges per worker are submitted ahead of
+    the range being consumed, so results waiting to be consumed in order stay
+    bounded however far the workers get ahead.
+
+    Args:
+        function: Picklable function called as function(input_file, start, end, *args)
+        input_file: Path to the JSON lines file
+        workers: Number of worker processes
+        *args: Extra arguments passed to every call of function
+        range_bytes: Size of the byte ranges, RANGE_BYTES if not given
+
+    Yields:
+        The result of function for each range, in file order
+    """
+    range_bytes = range_bytes or RANGE_BYTES
+    size = input_file.stat().st_size
+    max_in_flight = workers * RANGES_IN_FLIGHT_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start in range(0, size, range_bytes):
+            pending.append(pool.submit(function, input_file, start, min(start + range_bytes, size), *args))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def merge_stats(total: Dict[str, Any], part: Dict[str, Any]) -> None:
+    """
+    Add the counters of one statistics dictionary into another.
+
+    Nested dictionaries are merged recursively and keys missing from total are
+    added in the order they appear in part.
+
+    Args:
+        total: Statistics dictionary to update
+        part: Statistics dictionary whose counters are added
+    """
+    for key, value in part.items():
+        if isinstance(value, dict):
+            merge_stats(total.setdefault(key, {}), value)
+        else:
+            total[key] = total.get(key, 0) + value
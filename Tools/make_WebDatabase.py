@@ -19,17 +19,22 @@ and machine learning tasks that require clean, standardized data.
 
 Usage:
     python Tools/make_WebDatabase.py [--input INPUT_FILE] [--output OUTPUT_FILE] [--stats STATS_FILE]
+                                     [--workers N]
 
 Copyright (c) 2025 Angus Fung
 """
 
-import json
 import logging
+import orjson
+import msgspec
 import argparse
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TypedDict
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter
+from functools import lru_cache
+
+from line_ranges import map_ranges, merge_stats, read_range
 
 # Configure logging
 logging.basicConfig(
@@ -44,7 +49,10 @@ DEFAULT_OUTPUT_FILE = Path("/Users/Angusf777/Desktop/FYP OFFICIAL/Data/website_d
 DEFAULT_STATS_FILE = Path("/Users/Angusf777/Desktop/FYP OFFICIAL/Data/web_processing_stats.json")
 
 # States to exclude from processing
-EXCLUDED_STATES = {'submitted', 'live', 'started'}
+EXCLUDED_STATES = frozenset({'submitted', 'live', 'started'})
+
+# Write buffer size for the multi-GB output file
+IO_BUFFER_BYTES = 4 * 1024 * 1024
 
 def parse_arguments():
     """
@@ -60,8 +68,39 @@ def parse_arguments():
                       help='Path to output web database JSON file')
     parser.add_argument('--stats', type=Path, default=DEFAULT_STATS_FILE,
                       help='Path to output statistics JSON file')
+    parser.add_argument('--workers', type=int, default=1,
+                      help='Number of processes processing the input (default: 1)')
     return parser.parse_args()
 
+class RawCreator(TypedDict, total=False):
+    """Fields of a project's creator that are used by ProjectFormatter."""
+    id: Any
+    urls: Any
+
+class RawProject(TypedDict, total=False):
+    """Fields of a raw project that are used by ProjectFormatter."""
+    id: Any
+    state: Any
+    name: Any
+    blurb: Any
+    category: Any
+    location: Any
+    goal: Any
+    pledged: Any
+    static_usd_rate: Any
+    backers_count: Any
+    currency: Any
+    launched_at: Any
+    deadline: Any
+    percent_funded: Any
+    staff_pick: Any
+    creator: Optional[RawCreator]
+    urls: Any
+
+class RawRecord(TypedDict, total=False):
+    """A line of the Kickstarter data, decoded down to the fields in RawProject."""
+    data: Optional[RawProject]
+
 class ProjectFormatter:
     """
     Handles the formatting and processing of individual project records.
@@ -73,10 +112,14 @@ class ProjectFormatter:
     """
     
     @staticmethod
+    @lru_cache(maxsize=2**17)
     def format_date(timestamp: int) -> str:
         """
         Convert Unix timestamp to dd/mm/yyyy format.
         
+        Results are cached, as the same launch and deadline timestamps recur
+        across projects and relaunches.
+        
         Args:
             timestamp: Unix timestamp to convert
             
@@ -138,38 +181,47 @@ class ProjectFormatter:
         """
         try:
             # Check if project state is in excluded states
-            state = data.get("state", "").lower()
-            stats['by_state'][state] = stats['by_state'].get(state, 0) + 1
+            # Bind the lookups used for every field below
+            data_get = data.get
+            state = data_get("state", "").lower()
+            stats['by_state'][state] += 1
             
             if state in EXCLUDED_STATES:
-                stats['excluded_by_state'][state] = stats['excluded_by_state'].get(state, 0) + 1
+                stats['excluded_by_state'][state] += 1
                 return {}
                 
             # Calculate USD values using static_usd_rate
-            usd_rate = data.get("static_usd_rate", 1)
-            goal_usd = data.get("goal", 0) * usd_rate
-            pledged_usd = data.get("pledged", 0) * usd_rate
-            backers_count = data.get("backers_count", 0)
+            usd_rate = data_get("static_usd_rate", 1)
+            goal_usd = data_get("goal", 0) * usd_rate
+            pledged_usd = data_get("pledged", 0) * usd_rate
+            backers_count = data_get("backers_count", 0)
             
             # Calculate pledge per backer
             pledge_per_backer = round(pledged_usd / backers_count, 2) if backers_count else 0
             
             # Get category information
-            category = data.get("category", {})
+            category = data_get("category", {})
             category_slug = category.get("slug", "")
             parent_category = category_slug.split('/')[0] if category_slug else "unknown"
             
             # Get location information
-            location = data.get("location", {})
+            location = data_get("location", {})
+            
+            # Get creator information
+            creator = data_get("creator", {})
+            
+            # Get campaign dates
+            launched_at = data_get("launched_at")
+            deadline = data_get("deadline")
             
             # Update category stats
-            stats['by_category'][parent_category] = stats['by_category'].get(parent_category, 0) + 1
+            stats['by_category'][parent_category] += 1
             
             return {
-                "id": data.get("id"),
+                "id": data_get("id"),
                 "state": state,
-                "name": data.get("name"),
-                "blurb": data.get("blurb"),
+                "name": data_get("name"),
+                "blurb": data_get("blurb"),
                 "category": parent_category,
                 "subcategory": category_slug,
                 "country": location.get("expanded_country"),
@@ -177,30 +229,161 @@ class ProjectFormatter:
                 "goal_usd": goal_usd,
                 "pledged_usd": pledged_usd,
                 "backers_count": backers_count,
-                "currency": data.get("currency"),
-                "cal_launched_at": data.get("launched_at"),
-                "cal_deadline": data.get("deadline"),
-                "launched_at": ProjectFormatter.format_date(data.get("launched_at")),
-                "deadline": ProjectFormatter.format_date(data.get("deadline")),
+                "currency": data_get("currency"),
+                "cal_launched_at": launched_at,
+                "cal_deadline": deadline,
+                "launched_at": ProjectFormatter.format_date(launched_at),
+                "deadline": ProjectFormatter.format_date(deadline),
                 "campaign_duration": ProjectFormatter.calculate_duration(
-                    data.get("launched_at", 0), 
-                    data.get("deadline", 0)
+                    data_get("launched_at", 0), 
+                    data_get("deadline", 0)
                 ),
-                "percent_funded": data.get("percent_funded", 0),
+                "percent_funded": data_get("percent_funded", 0),
                 "pledge_per_backer": pledge_per_backer,
-                "is_staff_pick": data.get("staff_pick", False),
-                "creator_id": data.get('creator', {}).get('id'),
+                "is_staff_pick": data_get("staff_pick", False),
+                "creator_id": creator.get('id'),
                 "links": {
-                    "project": data.get("urls", {}).get("web", {}).get("project"),
-                    "creator": data.get("creator", {}).get("urls", {}).get("web", {}).get("user")
+                    "project": data_get("urls", {}).get("web", {}).get("project"),
+                    "creator": creator.get("urls", {}).get("web", {}).get("user")
                 }
             }
         except Exception as e:
             logger.error(f"Error processing project: {e}")
-            stats['errors']['processing'] = stats['errors'].get('processing', 0) + 1
+            stats['errors']['processing'] += 1
             return {}
 
-def process_database(input_file: Path, output_file: Path, stats_file: Path) -> None:
+def new_stats() -> Dict[str, Any]:
+    """
+    Create an empty statistics dictionary for the database processing.
+    
+    Returns:
+        Dict: Statistics with every counter at zero
+    """
+    return {
+        'summary': {'total_processed': 0, 'included': 0, 'excluded': 0},
+        'by_state': Counter(),
+        'excluded_by_state': Counter(),
+        'by_category': Counter(),
+        'errors': Counter()
+    }
+
+def _process_lines(lines: Iterable[bytes], stats: Dict[str, Any], option: int = 0) -> Iterator[bytes]:
+    """
+    Process projects line by line, yielding the serialized web database records.
+    
+    Args:
+        lines: JSON lines, one project per line
+        stats: Statistics dictionary to update, see new_stats()
+        option: orjson option flags used to serialize each record
+        
+    Yields:
+        bytes: Each included record serialized as JSON
+    """
+    # Bind the per-line lookups once, outside the loop. The decoder builds plain
+    # dicts holding only the fields in RawRecord, skipping the rest of each line
+    loads = msgspec.json.Decoder(RawRecord).decode
+    dumps = orjson.dumps
+    json_decode_error = msgspec.DecodeError
+    process_project = ProjectFormatter.process_project
+    
+    for line in lines:
+        stats['summary']['total_processed'] += 1
+        try:
+            record = loads(line)
+            project_data = process_project(record.get("data", {}), stats)
+            
+            if not project_data:
+                stats['summary']['excluded'] += 1
+                continue
+            serialized = dumps(project_data, option=option)
+                
+        except json_decode_error as e:
+            logger.error(f"Error decoding JSON at line {stats['summary']['total_processed']}: {e}")
+            stats['errors']['json_decode'] += 1
+            continue
+        except Exception as e:
+            logger.error(f"Unexpected error processing line {stats['summary']['total_processed']}: {e}")
+            stats['errors']['unexpected'] += 1
+            continue
+        
+        stats['summary']['included'] += 1
+        yield serialized
+
+def _process_chunk(input_file: Path, start: int, end: int, option: int) -> Tuple[List[bytes], Dict[str, Any]]:
+    """
+    Process the projects on the lines starting in the byte range [start, end).
+    
+    Line numbers in error messages count from the start of the range.
+    
+    Args:
+        input_file: Path to input JSON file containing filtered Kickstarter data
+        start: Offset of the first byte of the range
+        end: Offset one past the last byte of the range
+        option: orjson option flags used to serialize each record
+        
+    Returns:
+        Tuple containing:
+        - List[bytes]: The included records serialized as JSON
+        - Dict: Statistics for the range
+    """
+    stats = new_stats()
+    records = list(_process_lines(read_range(input_file, start, end), stats, option))
+    return records, stats
+
+def _process_parallel(input_file: Path, stats: Dict[str, Any], option: int, workers: int) -> Iterator[bytes]:
+    """
+    Process byte ranges of the input in worker processes, yielding the records in file order.
+    
+    The statistics of each range are added to stats as its records are yielded.
+    
+    Args:
+        input_file: Path to input JSON file containing filtered Kickstarter data
+        stats: Statistics dictionary to update, see new_stats()
+        option: orjson option flags used to serialize each record
+        workers: Number of worker processes
+        
+    Yields:
+        bytes: Each included record serialized as JSON
+    """
+    for records, chunk_stats in map_ranges(_process_chunk, input_file, workers, option):
+        merge_stats(stats, chunk_stats)
+        yield from records
+
+def save_stats(stats: Dict[str, Any], output_file: Path, stats_file: Path) -> None:
+    """
+    Save the processing statistics to a file and log a summary.
+    
+    Args:
+        stats: Statistics collected while processing, see new_stats()
+        output_file: Path of the web database the statistics describe
+        stats_file: Path to output statistics JSON file
+    """
+    # Save statistics. orjson writes the Counters as plain JSON objects
+    with open(stats_file, "wb") as statsfile:
+        statsfile.write(orjson.dumps(stats, option=orjson.OPT_INDENT_2))
+    
+    # Log completion statistics
+    logger.info("\nProcessing completed!")
+    logger.info(f"Total records processed: {stats['summary']['total_processed']}")
+    logger.info(f"Successfully included records: {stats['summary']['included']}")
+    logger.info(f"Excluded records: {stats['summary']['excluded']}")
+    logger.info("\nExcluded by state:")
+    for state, count in stats['excluded_by_state'].items():
+        logger.info(f"  {state}: {count}")
+    logger.info("\nTotal by state:")
+    for state, count in stats['by_state'].items():
+        logger.info(f"  {state}: {count}")
+    logger.info("\nBy category:")
+    for category, count in stats['by_category'].items():
+        logger.info(f"  {category}: {count}")
+    if stats['errors']:
+        logger.info("\nErrors encountered:")
+        for error_type, count in stats['errors'].items():
+            logger.info(f"  {error_type}: {count}")
+    logger.info(f"\nProcessed data saved to: {output_file}")
+    logger.info(f"Statistics saved to: {stats_file}")
+
+def process_database(input_file: Path, output_file: Path, stats_file: Path, workers: int = 1) -> None:
     """
     Main function to process Kickstarter data and create web database.
     
@@ -208,89 +391,59 @@ def process_database(input_file: Path, output_file: Path, stats_file: Path) -> N
     1. Reads the input file line by line
     2. Processes each project using ProjectFormatter
     3. Collects comprehensive statistics about the processing
-    4. Saves the processed records to the output file
+    4. Streams the processed records to the output file as they are produced
     5. Saves statistics to the stats file
     6. Logs summary information
     
+    With several workers, steps 1-3 run on byte ranges of the input in worker
+    processes, and the records are still written in file order.
+    
     Args:
         input_file: Path to input JSON file containing filtered Kickstarter data
-        output_file: Path to output web database JSON file
+        output_file: Path to output web database JSON file. Records are written as a
+            JSON array with one compact record per line, or as JSON Lines if the
+            path ends in .jsonl
         stats_file: Path to output statistics JSON file
+        workers: Number of processes processing the input
         
     Raises:
         Various exceptions may be caught and logged, with processing continuing
         where possible
     """
-    processed_records: List[Dict[str, Any]] = []
-    stats = {
-        'summary': {'total_processed': 0, 'included': 0, 'excluded': 0},
-        'by_state': defaultdict(int),
-        'excluded_by_state': defaultdict(int),
-        'by_category': defaultdict(int),
-        'errors': defaultdict(int)
-    }
+    stats = new_stats()
     
     logger.info("Starting to process Kickstarter data...")
     
     try:
-        with open(input_file, "r") as file:
-            for line in file:
-                stats['summary']['total_processed'] += 1
-                try:
-                    record = json.loads(line.strip())
-                    project_data = ProjectFormatter.process_project(record.get("data", {}), stats)
-                    
-                    if project_data:
-                        processed_records.append(project_data)
-                        stats['summary']['included'] += 1
-                        
-                        if stats['summary']['included'] % 1000 == 0:
-                            logger.info(f"Processed {stats['summary']['included']} records successfully...")
-                    else:
-                        stats['summary']['excluded'] += 1
-                            
-                except json.JSONDecodeError as e:
-                    logger.error(f"Error decoding JSON at line {stats['summary']['total_processed']}: {e}")
-                    stats['errors']['json_decode'] = stats['errors'].get('json_decode', 0) + 1
-                except Exception as e:
-                    logger.error(f"Unexpected error processing line {stats['summary']['total_processed']}: {e}")
-                    stats['errors']['unexpected'] = stats['errors'].get('unexpected', 0) + 1
+        json_lines = output_file.suffix == '.jsonl'
+        option = orjson.OPT_APPEND_NEWLINE if json_lines else 0
         
-        # Convert defaultdict to regular dict for JSON serialization
-        stats = {k: dict(v) if isinstance(v, defaultdict) else v for k, v in stats.items()}
-        
-        # Save the processed records
-        with open(output_file, "w") as outfile:
-            json.dump(processed_records, outfile, indent=2)
+        with open(output_file, "wb", buffering=IO_BUFFER_BYTES) as outfile:
+            write = outfile.write
+            if not json_lines:
+                write(b"[")
+            if workers > 1:
+                records = _process_parallel(input_file, stats, option, workers)
+            else:
+                lines = read_range(input_file, 0, input_file.stat().st_size)
+                records = _process_lines(lines, stats, option)
+            
+            for included, record in enumerate(records, 1):
+                if not json_lines:
+                    write(b",\n" if included > 1 else b"\n")
+                write(record)
+                
+                if included % 1000 == 0:
+                    logger.info(f"Processed {included} records successfully...")
             
-        # Save statistics
-        with open(stats_file, "w") as statsfile:
-            json.dump(stats, statsfile, indent=2)
+            if not json_lines:
+                write(b"\n]\n")
         
-        # Log completion statistics
-        logger.info("\nProcessing completed!")
-        logger.info(f"Total records processed: {stats['summary']['total_processed']}")
-        logger.info(f"Successfully included records: {stats['summary']['included']}")
-        logger.info(f"Excluded records: {stats['summary']['excluded']}")
-        logger.info("\nExcluded by state:")
-        for state, count in stats['excluded_by_state'].items():
-            logger.info(f"  {state}: {count}")
-        logger.info("\nTotal by state:")
-        for state, count in stats['by_state'].items():
-            logger.info(f"  {state}: {count}")
-        logger.info("\nBy category:")
-        for category, count in stats['by_category'].items():
-            logger.info(f"  {category}: {count}")
-        if stats['errors']:
-            logger.info("\nErrors encountered:")
-            for error_type, count in stats['errors'].items():
-                logger.info(f"  {error_type}: {count}")
-        logger.info(f"\nProcessed data saved to: {output_file}")
-        logger.info(f"Statistics saved to: {stats_file}")
+        save_stats(stats, output_file, stats_file)
         
     except Exception as e:
         logger.error(f"Fatal error: {e}")
 
 if __name__ == "__main__":
     args = parse_arguments()
-    process_database(args.input, args.output, args.stats)
+    process_database(args.input, args.output, args.stats, args.workers)
@@ -0,0 +1,237 @@
+"""
+Kickstarter Filter and Web Database Generator
+
+This module produces the outputs of filter_kickstarter.py and make_WebDatabase.py
+in a single pass over the raw Kickstarter data. Each line is parsed once, then
+passed through both the filtering rules (ProjectProcessor) and the web-friendly
+formatting (ProjectFormatter), so the multi-GB input is read and decoded once
+instead of once per tool.
+
+The filtered data, the web database and both statistics files match those
+written by running the two tools separately on the same input.
+
+Usage:
+    python Tools/process_kickstarter.py [--input INPUT_FILE]
+                                        [--filtered-output FILTERED_FILE] [--filtered-stats FILTERED_STATS_FILE]
+                                        [--web-output WEB_FILE] [--web-stats WEB_STATS_FILE]
+                                        [--workers N]
+
+Copyright (c) 2025 Angus Fung
+"""
+
+import logging
+import orjson
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import filter_kickstarter
+import make_WebDatabase
+from filter_kickstarter import filter_project
+from make_WebDatabase import ProjectFormatter
+from line_ranges import map_ranges, merge_stats, read_range
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Default paths, shared with the two separate tools
+DEFAULT_INPUT_FILE = filter_kickstarter.DEFAULT_INPUT_FILE
+DEFAULT_FILTERED_FILE = filter_kickstarter.DEFAULT_OUTPUT_FILE
+DEFAULT_FILTERED_STATS_FILE = filter_kickstarter.DEFAULT_STATS_FILE
+DEFAULT_WEB_FILE = make_WebDatabase.DEFAULT_OUTPUT_FILE
+DEFAULT_WEB_STATS_FILE = make_WebDatabase.DEFAULT_STATS_FILE
+
+# Write buffer size for the multi-GB output files
+IO_BUFFER_BYTES = 4 * 1024 * 1024
+
+def parse_arguments():
+    """
+    Parse command line arguments for the process_kickstarter script.
+
+    Returns:
+        argparse.Namespace: Object containing the parsed command line arguments
+    """
+    parser = argparse.ArgumentParser(
+        description='Filter Kickstarter data and generate the web database in one pass.')
+    parser.add_argument('--input', type=Path, default=DEFAULT_INPUT_FILE,
+                      help='Path to input JSON file')
+    parser.add_argument('--filtered-output', type=Path, default=DEFAULT_FILTERED_FILE,
+                      help='Path to output filtered JSON file')
+    parser.add_argument('--filtered-stats', type=Path, default=DEFAULT_FILTERED_STATS_FILE,
+                      help='Path to output filtering statistics JSON file')
+    parser.add_argument('--web-output', type=Path, default=DEFAULT_WEB_FILE,
+                      help='Path to output web database JSON file')
+    parser.add_argument('--web-stats', type=Path, default=DEFAULT_WEB_STATS_FILE,
+                      help='Path to output web database statistics JSON file')
+    parser.add_argument('--workers', type=int, default=1,
+                      help='Number of processes processing the input (default: 1)')
+    return parser.parse_args()
+
+def _process_lines(lines: Iterable[bytes], filter_stats: Dict[str, Any], web_stats: Dict[str, Any],
+                   web_option: int = 0) -> Iterator[Tuple[Optional[bytes], Optional[bytes]]]:
+    """
+    Filter and format projects line by line, parsing each line once.
+
+    Args:
+        lines: JSON lines, one project per line
+        filter_stats: Filtering statistics to update, see filter_kickstarter.new_stats()
+        web_stats: Web database statistics to update, see make_WebDatabase.new_stats()
+        web_option: orjson option flags used to serialize each web database record
+
+    Yields:
+        Tuple containing, for each line:
+        - Optional[bytes]: The project as a filtered JSON line, None if excluded
+        - Optional[bytes]: The web database record as JSON, None if excluded
+    """
+    # Bind the per-line lookups once, outside the loop
+    loads = orjson.loads
+    dumps = orjson.dumps
+    json_decode_error = orjson.JSONDecodeError
+    process_project = ProjectFormatter.process_project
+
+    for line in lines:
+        filter_stats['summary']['total_processed'] += 1
+        web_stats['summary']['total_processed'] += 1
+        try:
+            project = loads(line)
+        except json_decode_error as e:
+            logger.error(f"Error decoding JSON at line {web_stats['summary']['total_processed']}: {e}")
+            web_stats['errors']['json_decode'] += 1
+            continue
+
+        # The web record is built first, as the filter rewrites the state of
+        # the canceled projects it converts to failed
+        web_record = None
+        try:
+            project_data = process_project(project.get("data", {}), web_stats)
+            if project_data:
+                web_record = dumps(project_data, option=web_option)
+                web_stats['summary']['included'] += 1
+            else:
+                web_stats['summary']['excluded'] += 1
+        except Exception as e:
+            logger.error(f"Unexpected error processing line {web_stats['summary']['total_processed']}: {e}")
+            web_stats['errors']['unexpected'] += 1
+
+        filtered = None
+        try:
+            modified_project = filter_project(project, filter_stats)
+            if modified_project is not None:
+                filtered = dumps(modified_project, option=orjson.OPT_APPEND_NEWLINE)
+        except Exception as e:
+            logger.error(f"Error processing line: {e}")
+
+        yield filtered, web_record
+
+def _process_chunk(input_file: Path, start: int, end: int, web_option: int
+                   ) -> Tuple[List[Tuple[Optional[bytes], Optional[bytes]]], Dict[str, Any], Dict[str, Any]]:
+    """
+    Filter and format the projects on the lines starting in the byte range [start, end).
+
+    Args:
+        input_file: Path to input JSON file containing raw Kickstarter data
+        start: Offset of the first byte of the range
+        end: Offset one past the last byte of the range
+        web_option: orjson option flags used to serialize each web database record
+
+    Returns:
+        Tuple containing:
+        - List: The (filtered line, web record) pair of each line, see _process_lines()
+        - Dict: Filtering statistics for the range
+        - Dict: Web database statistics for the range
+    """
+    filter_stats = filter_kickstarter.new_stats()
+    web_stats = make_WebDatabase.new_stats()
+    outputs = list(_process_lines(read_range(input_file, start, end), filter_stats, web_stats, web_option))
+    return outputs, filter_stats, web_stats
+
+def _process_parallel(input_file: Path, filter_stats: Dict[str, Any], web_stats: Dict[str, Any],
+                      web_option: int, workers: int) -> Iterator[Tuple[Optional[bytes], Optional[bytes]]]:
+    """
+    Process byte ranges of the input in worker processes, yielding the outputs in file order.
+
+    The statistics of each range are added to filter_stats and web_stats as its
+    outputs are yielded.
+
+    Args:
+        input_file: Path to input JSON file containing raw Kickstarter data
+        filter_stats: Filtering statistics to update
+        web_stats: Web database statistics to update
+        web_option: orjson option flags used to serialize each web database record
+        workers: Number of worker processes
+
+    Yields:
+        Tuple: The (filtered line, web record) pair of each line, see _process_lines()
+    """
+    for outputs, chunk_filter_stats, chunk_web_stats in map_ranges(
+            _process_chunk, input_file, workers, web_option):
+        merge_stats(filter_stats, chunk_filter_stats)
+        merge_stats(web_stats, chunk_web_stats)
+        yield from outputs
+
+def process_kickstarter(input_file: Path, filtered_file: Path, filtered_stats_file: Path,
+                        web_file: Path, web_stats_file: Path, workers: int = 1) -> None:
+    """
+    Main function to filter Kickstarter data and create the web database in one pass.
+
+    Args:
+        input_file: Path to input JSON file containing raw Kickstarter data
+        filtered_file: Path to output filtered JSON file
+        filtered_stats_file: Path to output filtering statistics JSON file
+        web_file: Path to output web database JSON file. Records are written as a
+            JSON array with one compact record per line, or as JSON Lines if the
+            path ends in .jsonl
+        web_stats_file: Path to output web database statistics JSON file
+        workers: Number of processes processing the input
+    """
+    filter_stats = filter_kickstarter.new_stats()
+    web_stats = make_WebDatabase.new_stats()
+
+    logger.info("Starting to process Kickstarter data...")
+
+    try:
+        json_lines = web_file.suffix == '.jsonl'
+        web_option = orjson.OPT_APPEND_NEWLINE if json_lines else 0
+
+        with open(filtered_file, 'wb', buffering=IO_BUFFER_BYTES) as filtered_out, \
+                open(web_file, 'wb', buffering=IO_BUFFER_BYTES) as web_out:
+            write_filtered = filtered_out.write
+            write_web = web_out.write
+            if not json_lines:
+                write_web(b"[")
+            if workers > 1:
+                outputs = _process_parallel(input_file, filter_stats, web_stats, web_option, workers)
+            else:
+                lines = read_range(input_file, 0, input_file.stat().st_size)
+                outputs = _process_lines(lines, filter_stats, web_stats, web_option)
+
+            included = 0
+            for filtered, web_record in outputs:
+                if filtered is not None:
+                    write_filtered(filtered)
+                if web_record is not None:
+                    if not json_lines:
+                        write_web(b",\n" if included else b"\n")
+                    write_web(web_record)
+                    included += 1
+
+                    if included % 1000 == 0:
+                        logger.info(f"Processed {included} records successfully...")
+
+            if not json_lines:
+                write_web(b"\n]\n")
+
+        filter_kickstarter.save_stats(filter_stats, filtered_stats_file)
+        make_WebDatabase.save_stats(web_stats, web_file, web_stats_file)
+
+    except Exception as e:
+        logger.error(f"Fatal error: {e}")
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    process_kickstarter(args.input, args.filtered_output, args.filtered_stats,
+                        args.web_output, args.web_stats, args.workers)
@@ -5,14 +5,15 @@ This module performs temporal analysis of Kickstarter projects,
 calculating key metrics for specified time periods and their changes.
 """
 
-import json
 import argparse
+import orjson
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any, Tuple, List
 from collections import defaultdict
 from operator import itemgetter
+import numpy as np
 from plot.trending_cat import create_growth_plot
 from plot.funding_chart import create_funding_chart
 from plot.country_chart import create_country_chart
@@ -64,8 +65,12 @@ def get_category_metrics(projects: List[Dict[str, Any]], start_time: int, end_ti
         'successful_projects': 0
     })
     
-    for p in projects:
-        if start_time <= p['cal_deadline'] <= end_time:
+    # Compare all deadlines against the period at once, then visit the projects in it
+    deadlines = np.fromiter(map(itemgetter('cal_deadline'), projects), dtype=np.float64, count=len(projects))
+    in_period = (deadlines >= start_time) & (deadlines <= end_time)
+    
+    for p, keep in zip(projects, in_period.tolist()):
+        if keep:
             cat = p['subcategory'] if is_subcategory else p['category']
             metrics_by_cat[cat]['total_projects'] += 1
             metrics_by_cat[cat]['total_funds'] += p['pledged_usd']
@@ -133,21 +138,21 @@ def calculate_metrics(projects: List[Dict[str, Any]], start_time: int = None, en
         Dict containing calculated metrics
     """
     # Filter by category first
-    category_filtered = [p for p in projects if category == 'N/A' or p['category'] == category]
+    category_filtered = list(projects) if category == 'N/A' else [p for p in projects if p['category'] == category]
     
-    # If timeframe is specified, filter by deadline
+    # If timeframe is specified, filter by deadline, comparing all deadlines at once
     if start_time is not None and end_time is not None:
-        filtered_projects = [
-            p for p in category_filtered
-            if start_time <= p['cal_deadline'] <= end_time
-        ]
+        deadlines = np.fromiter(map(itemgetter('cal_deadline'), category_filtered),
+                                dtype=np.float64, count=len(category_filtered))
+        in_period = (deadlines >= start_time) & (deadlines <= end_time)
+        filtered_projects = [p for p, keep in zip(category_filtered, in_period.tolist()) if keep]
     else:
         filtered_projects = category_filtered
         # Find the actual date range in the data
         if filtered_projects:
             try:
-                earliest_launch = min(p['cal_launched_at'] for p in filtered_projects)
-                latest_deadline = max(p['cal_deadline'] for p in filtered_projects)
+                earliest_launch = min(map(itemgetter('cal_launched_at'), filtered_projects))
+                latest_deadline = max(map(itemgetter('cal_deadline'), filtered_projects))
                 logger.info(f"Earliest launch timestamp: {earliest_launch}")
                 logger.info(f"Latest deadline timestamp: {latest_deadline}")
                 
@@ -164,7 +169,7 @@ def calculate_metrics(projects: List[Dict[str, Any]], start_time: int = None, en
                 raise
     
     total_projects = len(filtered_projects)
-    total_funds = sum(p['pledged_usd'] for p in filtered_projects)
+    total_funds = sum(map(itemgetter('pledged_usd'), filtered_projects))
     successful_projects = sum(1 for p in filtered_projects if p['state'] == 'successful')
     success_rate = (successful_projects / total_projects * 100) if total_projects > 0 else 0
     
@@ -269,8 +274,8 @@ def analyze_projects(input_file: Path, category: str = 'N/A', timeframe: str = '
     """
     try:
         # Load project data
-        with open(input_file, 'r') as f:
-            projects = json.load(f)
+        with open(input_file, 'rb') as f:
+            projects = orjson.loads(f.read())
         
         if timeframe == 'N/A':
             # Analyze full database
@@ -0,0 +1,31 @@
+"""
+Tests for backer_analysis.py when the requested timeframe has no projects.
+
+Run with:
+    python -m pytest Tools/test_backer_analysis.py
+"""
+
+import argparse
+import json
+
+import backer_analysis
+
+def test_empty_timeframe_from_json(tmp_path, monkeypatch):
+    # One project, well before the 7 day window ending at END_DATE
+    project = {
+        'id': 1, 'name': 'Old Project', 'category': 'games', 'subcategory': 'tabletop games',
+        'backers_count': 10, 'pledged_usd': 500.0,
+        'cal_deadline': backer_analysis.END_DATE - 365 * 24 * 60 * 60,
+        'links': {'project': 'https://www.kickstarter.com/projects/old'}
+    }
+    input_file = tmp_path / 'website_database.json'
+    input_file.write_text(json.dumps([project]))
+    monkeypatch.setattr(backer_analysis, 'INPUT_FILE', str(input_file))
+    monkeypatch.setattr(backer_analysis, 'PARQUET_FILE', str(tmp_path / 'missing.parquet'))
+
+    args = argparse.Namespace(timeframe='7d', category=None)
+    projects = backer_analysis.load_projects(args)
+
+    assert projects.empty
+    assert backer_analysis.analyze_backer_funding(projects) == ([], [])
+    assert backer_analysis.find_top_funded_projects(projects) == []